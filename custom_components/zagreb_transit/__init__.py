@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from functools import partial
 import logging
 
 import voluptuous as vol
@@ -28,6 +29,9 @@ from .coordinator import ZagrebTransitCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+# Only one entry is allowed, so services resolve the coordinator with a single lookup.
+_ACTIVE_COORDINATOR = "_active"
+
 SERVICE_FORCE_SCHEMA = vol.Schema({vol.Required("version"): cv.string})
 SERVICE_ADD_WATCH_SCHEMA = vol.Schema(
     {
@@ -54,82 +58,45 @@ SERVICE_DUPLICATE_WATCH_SCHEMA = vol.Schema(
 )
 
 
+# service -> (coordinator method, fixed kwargs, schema)
+_SERVICE_DISPATCH: dict[str, tuple[str, dict, vol.Schema | None]] = {
+    # Manual refresh services should always bypass refresh interval guard.
+    SERVICE_REFRESH_STATIC: ("async_refresh_static", {"force": True}, None),
+    SERVICE_REFRESH_REALTIME: ("async_refresh_realtime", {"force": True}, None),
+    SERVICE_REBUILD_INDEXES: ("async_rebuild_indexes", {}, None),
+    SERVICE_VALIDATE_ACTIVE_FEED: ("async_validate_active_feed", {}, None),
+    SERVICE_FORCE_SELECT_FEED: ("async_force_select_feed", {}, SERVICE_FORCE_SCHEMA),
+    SERVICE_ADD_WATCH: ("async_add_watch", {}, SERVICE_ADD_WATCH_SCHEMA),
+    SERVICE_UPDATE_WATCH: ("async_update_watch", {}, SERVICE_UPDATE_WATCH_SCHEMA),
+    SERVICE_REMOVE_WATCH: ("async_remove_watch", {}, SERVICE_REMOVE_WATCH_SCHEMA),
+    SERVICE_DUPLICATE_WATCH: ("async_duplicate_watch", {}, SERVICE_DUPLICATE_WATCH_SCHEMA),
+}
+
+
+async def _async_handle_service(
+    hass: HomeAssistant,
+    handler_name: str,
+    extra: dict,
+    call: ServiceCall,
+) -> None:
+    coordinator = hass.data.get(DOMAIN, {}).get(_ACTIVE_COORDINATOR)
+    if coordinator is None:
+        _LOGGER.warning("No %s entries loaded", DOMAIN)
+        return
+    # Only merge when fixed kwargs exist; they must override caller-supplied keys.
+    data = {**call.data, **extra} if extra else call.data
+    await getattr(coordinator, handler_name)(**data)
+
+
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up Zagreb Transit domain services."""
-
-    async def _with_coordinator(call: ServiceCall, handler_name: str, **kwargs):
-        entries = hass.data.get(DOMAIN, {})
-        if not entries:
-            _LOGGER.warning("No %s entries loaded", DOMAIN)
-            return None
-        coordinator = next(iter(entries.values()))
-        data = dict(call.data)
-        data.update(kwargs)
-        return await getattr(coordinator, handler_name)(**data)
-
-    async def handle_refresh_static(call: ServiceCall) -> None:
-        # Manual refresh service should always bypass refresh interval guard.
-        await _with_coordinator(call, "async_refresh_static", force=True)
-
-    async def handle_refresh_realtime(call: ServiceCall) -> None:
-        # Manual refresh service should always bypass refresh interval guard.
-        await _with_coordinator(call, "async_refresh_realtime", force=True)
-
-    async def handle_rebuild_indexes(call: ServiceCall) -> None:
-        await _with_coordinator(call, "async_rebuild_indexes")
-
-    async def handle_validate(call: ServiceCall) -> None:
-        await _with_coordinator(call, "async_validate_active_feed")
-
-    async def handle_force(call: ServiceCall) -> None:
-        await _with_coordinator(call, "async_force_select_feed")
-
-    async def handle_add_watch(call: ServiceCall) -> None:
-        await _with_coordinator(call, "async_add_watch")
-
-    async def handle_update_watch(call: ServiceCall) -> None:
-        await _with_coordinator(call, "async_update_watch")
-
-    async def handle_remove_watch(call: ServiceCall) -> None:
-        await _with_coordinator(call, "async_remove_watch")
-
-    async def handle_duplicate_watch(call: ServiceCall) -> None:
-        await _with_coordinator(call, "async_duplicate_watch")
-
-    hass.services.async_register(DOMAIN, SERVICE_REFRESH_STATIC, handle_refresh_static)
-    hass.services.async_register(DOMAIN, SERVICE_REFRESH_REALTIME, handle_refresh_realtime)
-    hass.services.async_register(DOMAIN, SERVICE_REBUILD_INDEXES, handle_rebuild_indexes)
-    hass.services.async_register(DOMAIN, SERVICE_VALIDATE_ACTIVE_FEED, handle_validate)
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_FORCE_SELECT_FEED,
-        handle_force,
-        schema=SERVICE_FORCE_SCHEMA,
-    )
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_ADD_WATCH,
-        handle_add_watch,
-        schema=SERVICE_ADD_WATCH_SCHEMA,
-    )
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_UPDATE_WATCH,
-        handle_update_watch,
-        schema=SERVICE_UPDATE_WATCH_SCHEMA,
-    )
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_REMOVE_WATCH,
-        handle_remove_watch,
-        schema=SERVICE_REMOVE_WATCH_SCHEMA,
-    )
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_DUPLICATE_WATCH,
-        handle_duplicate_watch,
-        schema=SERVICE_DUPLICATE_WATCH_SCHEMA,
-    )
+    for service, (handler_name, extra, schema) in _SERVICE_DISPATCH.items():
+        hass.services.async_register(
+            DOMAIN,
+            service,
+            partial(_async_handle_service, hass, handler_name, extra),
+            schema=schema,
+        )
 
     return True
 
@@ -141,6 +108,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    hass.data[DOMAIN][_ACTIVE_COORDINATOR] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
@@ -150,18 +118,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        domain_data = hass.data.get(DOMAIN, {})
+        coordinator = domain_data.pop(entry.entry_id, None)
+        if coordinator is not None:
+            await coordinator.async_flush_stores()
+            if domain_data.get(_ACTIVE_COORDINATOR) is coordinator:
+                domain_data.pop(_ACTIVE_COORDINATOR)
 
     if not hass.data.get(DOMAIN):
-        hass.services.async_remove(DOMAIN, SERVICE_REFRESH_STATIC)
-        hass.services.async_remove(DOMAIN, SERVICE_REFRESH_REALTIME)
-        hass.services.async_remove(DOMAIN, SERVICE_REBUILD_INDEXES)
-        hass.services.async_remove(DOMAIN, SERVICE_VALIDATE_ACTIVE_FEED)
-        hass.services.async_remove(DOMAIN, SERVICE_FORCE_SELECT_FEED)
-        hass.services.async_remove(DOMAIN, SERVICE_ADD_WATCH)
-        hass.services.async_remove(DOMAIN, SERVICE_UPDATE_WATCH)
-        hass.services.async_remove(DOMAIN, SERVICE_REMOVE_WATCH)
-        hass.services.async_remove(DOMAIN, SERVICE_DUPLICATE_WATCH)
+        for service in _SERVICE_DISPATCH:
+            hass.services.async_remove(DOMAIN, service)
         hass.data.pop(DOMAIN, None)
 
     return unload_ok
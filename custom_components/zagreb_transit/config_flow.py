@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -40,6 +42,79 @@ ACTION_ADD = "add_watch"
 ACTION_EDIT = "edit_watch"
 ACTION_REMOVE = "remove_watch"
 
+# Validators are immutable, so build them once instead of per form render.
+_INTERVAL_RANGE = vol.All(vol.Coerce(int), vol.Range(min=30, max=3600))
+_STATIC_HOURS_RANGE = vol.All(vol.Coerce(int), vol.Range(min=1, max=48))
+_WINDOW_RANGE = vol.All(vol.Coerce(int), vol.Range(min=MIN_WINDOW_MINUTES, max=MAX_WINDOW_MINUTES))
+_LIMIT_RANGE = vol.All(vol.Coerce(int), vol.Range(min=MIN_WATCH_LIMIT, max=MAX_WATCH_LIMIT))
+_MAXSTOPS_RANGE = vol.All(vol.Coerce(int), vol.Range(min=MIN_WATCH_MAX_STOPS, max=MAX_WATCH_MAX_STOPS))
+_RADIUS_RANGE = vol.All(vol.Coerce(int), vol.Range(min=MIN_NEARBY_RADIUS_METERS, max=MAX_NEARBY_RADIUS_METERS))
+_NEARBY_MAX_STOPS_RANGE = vol.All(vol.Coerce(int), vol.Range(min=1, max=20))
+_LIMIT_PER_STOP_RANGE = vol.All(vol.Coerce(int), vol.Range(min=1, max=30))
+_VEHICLE_TYPE_IN = vol.In(WATCH_VEHICLE_TYPES)
+_LOCATION_SOURCE_IN = vol.In([WATCH_LOCATION_PERSON, WATCH_LOCATION_ZONE, WATCH_LOCATION_FIXED])
+
+_ACTION_MENU_HR = {
+    "Osnovne postavke (intervali osvježavanja i ponašanje)": ACTION_CORE,
+    "Dodaj praćenje (novi transit entitet)": ACTION_ADD,
+    "Uredi praćenje (izmijeni postojeći entitet)": ACTION_EDIT,
+    "Ukloni praćenje (obriši postojeći entitet)": ACTION_REMOVE,
+}
+_ACTION_MENU_EN = {
+    "Core settings (refresh intervals, base behavior)": ACTION_CORE,
+    "Add watch (new transit tracking entity)": ACTION_ADD,
+    "Edit watch (modify existing tracking entity)": ACTION_EDIT,
+    "Remove watch (delete existing tracking entity)": ACTION_REMOVE,
+}
+_WATCH_TYPE_MENU_HR = {
+    "Relacija (polazna -> odredišna s ETA)": "od",
+    "Polasci (samo s polazne stanice)": "departure",
+    "U blizini (osoba/zona/fiksna lokacija)": "nearby",
+    "Upit stanica (više naziva stanica)": "station_query",
+}
+_WATCH_TYPE_MENU_EN = {
+    "Route watch (start -> destination with ETA)": "od",
+    "Departure watch (from stop only)": "departure",
+    "Nearby watch (person/zone/fixed location)": "nearby",
+    "Station query watch (multiple station names)": "station_query",
+}
+_ALWAYS_ACTIONS = frozenset({ACTION_CORE, ACTION_ADD})
+_WATCH_ACTIONS = frozenset({ACTION_EDIT, ACTION_REMOVE})
+_ALWAYS_LABELS_HR = tuple(label for label, action in _ACTION_MENU_HR.items() if action in _ALWAYS_ACTIONS)
+_ALWAYS_LABELS_EN = tuple(label for label, action in _ACTION_MENU_EN.items() if action in _ALWAYS_ACTIONS)
+_WATCH_LABELS_HR = tuple(label for label, action in _ACTION_MENU_HR.items() if action in _WATCH_ACTIONS)
+_WATCH_LABELS_EN = tuple(label for label, action in _ACTION_MENU_EN.items() if action in _WATCH_ACTIONS)
+_WATCH_TYPE_LABELS_HR = tuple(_WATCH_TYPE_MENU_HR)
+_WATCH_TYPE_LABELS_EN = tuple(_WATCH_TYPE_MENU_EN)
+
+_DEFAULT_OPTIONS = {
+    CONF_UPDATE_INTERVAL: DEFAULT_UPDATE_INTERVAL,
+    CONF_REALTIME_INTERVAL: DEFAULT_REALTIME_INTERVAL,
+    CONF_STATIC_REFRESH_HOURS: DEFAULT_STATIC_REFRESH_HOURS,
+    CONF_DEFAULT_WINDOW_MINUTES: DEFAULT_WINDOW_MINUTES,
+    CONF_NOTIFICATIONS_ENABLED: DEFAULT_NOTIFICATIONS_ENABLED,
+}
+
+
+@lru_cache(maxsize=16)
+def _core_schema(
+    update_interval: int,
+    realtime_interval: int,
+    static_refresh_hours: int,
+    default_window_minutes: int,
+    notifications_enabled: bool,
+) -> vol.Schema:
+    """Return the core options schema for one set of defaults."""
+    return vol.Schema(
+        {
+            vol.Required(CONF_UPDATE_INTERVAL, default=update_interval): _INTERVAL_RANGE,
+            vol.Required(CONF_REALTIME_INTERVAL, default=realtime_interval): _INTERVAL_RANGE,
+            vol.Required(CONF_STATIC_REFRESH_HOURS, default=static_refresh_hours): _STATIC_HOURS_RANGE,
+            vol.Required(CONF_DEFAULT_WINDOW_MINUTES, default=default_window_minutes): _WINDOW_RANGE,
+            vol.Required(CONF_NOTIFICATIONS_ENABLED, default=notifications_enabled): cv.boolean,
+        }
+    )
+
 
 class ZagrebTransitConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle config flow for Zagreb Transit."""
@@ -71,40 +146,20 @@ class ZagrebTransitOptionsFlow(config_entries.OptionsFlow):
         self._pending_watch_enabled: bool = True
         self._pending_cfg: dict = {}
         self._edit_watch_id: str | None = None
+        self._lang_is_hr: bool | None = None
+        self._watch_choices_map: dict[str, str] | None = None
 
     def _is_hr(self) -> bool:
-        lang = str(getattr(self.hass.config, "language", "") or "").lower()
-        return lang.startswith("hr")
+        if self._lang_is_hr is None:
+            lang = str(getattr(self.hass.config, "language", "") or "").lower()
+            self._lang_is_hr = lang.startswith("hr")
+        return self._lang_is_hr
 
     def _action_menu(self) -> dict[str, str]:
-        if self._is_hr():
-            return {
-                "Osnovne postavke (intervali osvježavanja i ponašanje)": ACTION_CORE,
-                "Dodaj praćenje (novi transit entitet)": ACTION_ADD,
-                "Uredi praćenje (izmijeni postojeći entitet)": ACTION_EDIT,
-                "Ukloni praćenje (obriši postojeći entitet)": ACTION_REMOVE,
-            }
-        return {
-            "Core settings (refresh intervals, base behavior)": ACTION_CORE,
-            "Add watch (new transit tracking entity)": ACTION_ADD,
-            "Edit watch (modify existing tracking entity)": ACTION_EDIT,
-            "Remove watch (delete existing tracking entity)": ACTION_REMOVE,
-        }
+        return _ACTION_MENU_HR if self._is_hr() else _ACTION_MENU_EN
 
     def _watch_type_menu(self) -> dict[str, str]:
-        if self._is_hr():
-            return {
-                "Relacija (polazna -> odredišna s ETA)": "od",
-                "Polasci (samo s polazne stanice)": "departure",
-                "U blizini (osoba/zona/fiksna lokacija)": "nearby",
-                "Upit stanica (više naziva stanica)": "station_query",
-            }
-        return {
-            "Route watch (start -> destination with ETA)": "od",
-            "Departure watch (from stop only)": "departure",
-            "Nearby watch (person/zone/fixed location)": "nearby",
-            "Station query watch (multiple station names)": "station_query",
-        }
+        return _WATCH_TYPE_MENU_HR if self._is_hr() else _WATCH_TYPE_MENU_EN
 
     async def async_step_init(self, user_input=None):
         coordinator = self._coordinator()
@@ -112,11 +167,10 @@ class ZagrebTransitOptionsFlow(config_entries.OptionsFlow):
             return self.async_abort(reason="unknown")
 
         action_menu = self._action_menu()
-        actions = [label for label, action in action_menu.items() if action in {ACTION_CORE, ACTION_ADD}]
+        is_hr = self._is_hr()
+        actions = list(_ALWAYS_LABELS_HR if is_hr else _ALWAYS_LABELS_EN)
         if coordinator.watch_ids():
-            actions.extend(
-                [label for label, action in action_menu.items() if action in {ACTION_EDIT, ACTION_REMOVE}]
-            )
+            actions.extend(_WATCH_LABELS_HR if is_hr else _WATCH_LABELS_EN)
 
         if user_input is not None:
             action = action_menu.get(user_input["action"], ACTION_CORE)
@@ -142,15 +196,15 @@ class ZagrebTransitOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
 
-        opt = {**_default_options(), **self.config_entry.options}
-        schema: dict = {
-            vol.Required(CONF_UPDATE_INTERVAL, default=opt.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)): vol.All(vol.Coerce(int), vol.Range(min=30, max=3600)),
-            vol.Required(CONF_REALTIME_INTERVAL, default=opt.get(CONF_REALTIME_INTERVAL, DEFAULT_REALTIME_INTERVAL)): vol.All(vol.Coerce(int), vol.Range(min=30, max=3600)),
-            vol.Required(CONF_STATIC_REFRESH_HOURS, default=opt.get(CONF_STATIC_REFRESH_HOURS, DEFAULT_STATIC_REFRESH_HOURS)): vol.All(vol.Coerce(int), vol.Range(min=1, max=48)),
-            vol.Required(CONF_DEFAULT_WINDOW_MINUTES, default=opt.get(CONF_DEFAULT_WINDOW_MINUTES, DEFAULT_WINDOW_MINUTES)): vol.All(vol.Coerce(int), vol.Range(min=MIN_WINDOW_MINUTES, max=MAX_WINDOW_MINUTES)),
-            vol.Required(CONF_NOTIFICATIONS_ENABLED, default=bool(opt.get(CONF_NOTIFICATIONS_ENABLED, DEFAULT_NOTIFICATIONS_ENABLED))): cv.boolean,
-        }
-        return self.async_show_form(step_id="core", data_schema=vol.Schema(schema))
+        opt = _DEFAULT_OPTIONS | self.config_entry.options
+        schema = _core_schema(
+            opt[CONF_UPDATE_INTERVAL],
+            opt[CONF_REALTIME_INTERVAL],
+            opt[CONF_STATIC_REFRESH_HOURS],
+            opt[CONF_DEFAULT_WINDOW_MINUTES],
+            bool(opt[CONF_NOTIFICATIONS_ENABLED]),
+        )
+        return self.async_show_form(step_id="core", data_schema=schema)
 
     async def async_step_add_watch_basic(self, user_input=None):
         watch_type_menu = self._watch_type_menu()
@@ -166,7 +220,9 @@ class ZagrebTransitOptionsFlow(config_entries.OptionsFlow):
             data_schema=vol.Schema(
                 {
                     vol.Required("name"): cv.string,
-                    vol.Required("watch_type"): vol.In(list(watch_type_menu)),
+                    vol.Required("watch_type"): vol.In(
+                        _WATCH_TYPE_LABELS_HR if self._is_hr() else _WATCH_TYPE_LABELS_EN
+                    ),
                     vol.Required("enabled", default=True): cv.boolean,
                 }
             ),
@@ -177,14 +233,9 @@ class ZagrebTransitOptionsFlow(config_entries.OptionsFlow):
         if coordinator is None:
             return self.async_abort(reason="unknown")
 
-        summaries = coordinator.watch_summaries()
-        if not summaries:
+        choices_map = self._watch_choices(coordinator)
+        if not choices_map:
             return self.async_create_entry(title="", data=self.config_entry.options)
-
-        choices_map = {
-            f"{row.get('name') or row.get('watch_id')} [{row.get('type')}]": row["watch_id"]
-            for row in summaries
-        }
         labels = list(choices_map)
 
         if user_input is not None:
@@ -234,14 +285,9 @@ class ZagrebTransitOptionsFlow(config_entries.OptionsFlow):
         if coordinator is None:
             return self.async_abort(reason="unknown")
 
-        summaries = coordinator.watch_summaries()
-        if not summaries:
+        choices_map = self._watch_choices(coordinator)
+        if not choices_map:
             return self.async_create_entry(title="", data=self.config_entry.options)
-
-        choices_map = {
-            f"{row.get('name') or row.get('watch_id')} [{row.get('type')}]": row["watch_id"]
-            for row in summaries
-        }
         labels = list(choices_map)
 
         if user_input is not None:
@@ -249,6 +295,7 @@ class ZagrebTransitOptionsFlow(config_entries.OptionsFlow):
             if not watch_id:
                 return self.async_abort(reason="unknown")
             await coordinator.async_remove_watch(watch_id)
+            self._watch_choices_map = None
             return self.async_create_entry(title="", data=self.config_entry.options)
 
         return self.async_show_form(
@@ -269,12 +316,12 @@ class ZagrebTransitOptionsFlow(config_entries.OptionsFlow):
                 return await self.async_step_watch_station_query()
 
         schema = {
-            vol.Required("vehicle_type", default=str(self._pending_cfg.get("vehicle_type", "All"))): vol.In(WATCH_VEHICLE_TYPES),
-            vol.Required("window_minutes", default=int(self._pending_cfg.get("window_minutes", DEFAULT_WINDOW_MINUTES))): vol.All(vol.Coerce(int), vol.Range(min=MIN_WINDOW_MINUTES, max=MAX_WINDOW_MINUTES)),
-            vol.Required("limit", default=int(self._pending_cfg.get("limit", 20))): vol.All(vol.Coerce(int), vol.Range(min=MIN_WATCH_LIMIT, max=MAX_WATCH_LIMIT)),
+            vol.Required("vehicle_type", default=str(self._pending_cfg.get("vehicle_type", "All"))): _VEHICLE_TYPE_IN,
+            vol.Required("window_minutes", default=int(self._pending_cfg.get("window_minutes", DEFAULT_WINDOW_MINUTES))): _WINDOW_RANGE,
+            vol.Required("limit", default=int(self._pending_cfg.get("limit", 20))): _LIMIT_RANGE,
         }
         if self._pending_watch_type == "departure":
-            schema[vol.Required("max_stops", default=int(self._pending_cfg.get("max_stops", 12)))] = vol.All(vol.Coerce(int), vol.Range(min=MIN_WATCH_MAX_STOPS, max=MAX_WATCH_MAX_STOPS))
+            schema[vol.Required("max_stops", default=int(self._pending_cfg.get("max_stops", 12)))] = _MAXSTOPS_RANGE
         return self.async_show_form(step_id="watch_mode", data_schema=vol.Schema(schema))
 
     async def async_step_watch_nearby_source(self, user_input=None):
@@ -289,33 +336,26 @@ class ZagrebTransitOptionsFlow(config_entries.OptionsFlow):
                     vol.Required(
                         "location_source_type",
                         default=str(self._pending_cfg.get("location_source_type", WATCH_LOCATION_PERSON)),
-                    ): vol.In([WATCH_LOCATION_PERSON, WATCH_LOCATION_ZONE, WATCH_LOCATION_FIXED]),
+                    ): _LOCATION_SOURCE_IN,
                 }
             ),
         )
 
     async def async_step_watch_nearby_location(self, user_input=None):
-        source_type = str(self._pending_cfg.get("location_source_type", WATCH_LOCATION_PERSON)).strip()
-
-        person_entities = sorted([st.entity_id for st in self.hass.states.async_all("person")])
-        zone_entities = sorted([st.entity_id for st in self.hass.states.async_all("zone")])
-        person_choices = self._with_default(person_entities if person_entities else [""], str(self._pending_cfg.get("person_entity", "")))
-        zone_choices = self._with_default(zone_entities if zone_entities else [""], str(self._pending_cfg.get("zone_entity", "")))
-
         if user_input is not None:
             self._pending_cfg.update(user_input)
             return await self.async_step_watch_nearby_filters()
 
-        if source_type == WATCH_LOCATION_PERSON:
-            schema = vol.Schema(
-                {
-                    vol.Required("person_entity", default=str(self._pending_cfg.get("person_entity", person_choices[0]))): vol.In(person_choices),
-                }
-            )
-        elif source_type == WATCH_LOCATION_ZONE:
+        source_type = str(self._pending_cfg.get("location_source_type", WATCH_LOCATION_PERSON)).strip()
+
+        if source_type in (WATCH_LOCATION_PERSON, WATCH_LOCATION_ZONE):
+            # Only walk the state registry for the domain this form actually shows.
+            field = "person_entity" if source_type == WATCH_LOCATION_PERSON else "zone_entity"
+            entities = sorted(st.entity_id for st in self.hass.states.async_all(source_type))
+            choices = self._with_default(entities if entities else [""], str(self._pending_cfg.get(field, "")))
             schema = vol.Schema(
                 {
-                    vol.Required("zone_entity", default=str(self._pending_cfg.get("zone_entity", zone_choices[0]))): vol.In(zone_choices),
+                    vol.Required(field, default=str(self._pending_cfg.get(field, choices[0]))): vol.In(choices),
                 }
             )
         else:
@@ -334,11 +374,11 @@ class ZagrebTransitOptionsFlow(config_entries.OptionsFlow):
             return await self._finalize_watch()
 
         schema = {
-            vol.Required("vehicle_type", default=str(self._pending_cfg.get("vehicle_type", "All"))): vol.In(WATCH_VEHICLE_TYPES),
-            vol.Required("window_minutes", default=int(self._pending_cfg.get("window_minutes", DEFAULT_WINDOW_MINUTES))): vol.All(vol.Coerce(int), vol.Range(min=MIN_WINDOW_MINUTES, max=MAX_WINDOW_MINUTES)),
-            vol.Required("radius_meters", default=int(self._pending_cfg.get("radius_meters", DEFAULT_NEARBY_RADIUS_METERS))): vol.All(vol.Coerce(int), vol.Range(min=MIN_NEARBY_RADIUS_METERS, max=MAX_NEARBY_RADIUS_METERS)),
-            vol.Required("max_stops", default=int(self._pending_cfg.get("max_stops", 8))): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
-            vol.Required("limit_per_stop", default=int(self._pending_cfg.get("limit_per_stop", 6))): vol.All(vol.Coerce(int), vol.Range(min=1, max=30)),
+            vol.Required("vehicle_type", default=str(self._pending_cfg.get("vehicle_type", "All"))): _VEHICLE_TYPE_IN,
+            vol.Required("window_minutes", default=int(self._pending_cfg.get("window_minutes", DEFAULT_WINDOW_MINUTES))): _WINDOW_RANGE,
+            vol.Required("radius_meters", default=int(self._pending_cfg.get("radius_meters", DEFAULT_NEARBY_RADIUS_METERS))): _RADIUS_RANGE,
+            vol.Required("max_stops", default=int(self._pending_cfg.get("max_stops", 8))): _NEARBY_MAX_STOPS_RANGE,
+            vol.Required("limit_per_stop", default=int(self._pending_cfg.get("limit_per_stop", 6))): _LIMIT_PER_STOP_RANGE,
         }
         return self.async_show_form(step_id="watch_nearby_filters", data_schema=vol.Schema(schema))
 
@@ -467,8 +507,8 @@ class ZagrebTransitOptionsFlow(config_entries.OptionsFlow):
                 default=str(self._pending_cfg.get("route_filter", routes[0] if routes else "")),
             ): vol.In(routes),
             vol.Required("direction", default=str(self._pending_cfg.get("direction", "All"))): cv.string,
-            vol.Required("max_stops", default=int(self._pending_cfg.get("max_stops", 12))): vol.All(vol.Coerce(int), vol.Range(min=MIN_WATCH_MAX_STOPS, max=MAX_WATCH_MAX_STOPS)),
-            vol.Required("limit", default=int(self._pending_cfg.get("limit", 20))): vol.All(vol.Coerce(int), vol.Range(min=MIN_WATCH_LIMIT, max=MAX_WATCH_LIMIT)),
+            vol.Required("max_stops", default=int(self._pending_cfg.get("max_stops", 12))): _MAXSTOPS_RANGE,
+            vol.Required("limit", default=int(self._pending_cfg.get("limit", 20))): _LIMIT_RANGE,
         }
         return self.async_show_form(step_id="watch_station_query", data_schema=vol.Schema(schema))
 
@@ -504,11 +544,20 @@ class ZagrebTransitOptionsFlow(config_entries.OptionsFlow):
                 config=payload,
             )
 
+        self._watch_choices_map = None
         return self.async_create_entry(title="", data=self.config_entry.options)
 
     def _coordinator(self):
         return self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
 
+    def _watch_choices(self, coordinator) -> dict[str, str]:
+        if self._watch_choices_map is None:
+            self._watch_choices_map = {
+                row["label"]: row["watch_id"]
+                for row in coordinator.watch_summaries()
+            }
+        return self._watch_choices_map
+
     def _index(self):
         coordinator = self._coordinator()
         if coordinator is None:
@@ -516,19 +565,15 @@ class ZagrebTransitOptionsFlow(config_entries.OptionsFlow):
         return coordinator.index
 
     def _with_default(self, options: list[str], default_value: str) -> list[str]:
-        out = [opt for opt in options if opt is not None]
-        if default_value and default_value not in out:
-            out.insert(0, default_value)
-        if not out:
-            out = [default_value or ""]
-        return out
+        # Return the caller's list untouched when nothing needs to change.
+        if None in options:
+            options = [opt for opt in options if opt is not None]
+        if not options:
+            return [default_value or ""]
+        if default_value and default_value != options[0] and default_value not in options:
+            return [default_value, *options]
+        return options
 
 
 def _default_options() -> dict:
-    return {
-        CONF_UPDATE_INTERVAL: DEFAULT_UPDATE_INTERVAL,
-        CONF_REALTIME_INTERVAL: DEFAULT_REALTIME_INTERVAL,
-        CONF_STATIC_REFRESH_HOURS: DEFAULT_STATIC_REFRESH_HOURS,
-        CONF_DEFAULT_WINDOW_MINUTES: DEFAULT_WINDOW_MINUTES,
-        CONF_NOTIFICATIONS_ENABLED: DEFAULT_NOTIFICATIONS_ENABLED,
-    }
+    return dict(_DEFAULT_OPTIONS)
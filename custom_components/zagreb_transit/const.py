@@ -28,6 +28,7 @@ DEFAULT_NOTIFICATIONS_ENABLED = False
 
 MAX_LISTING_CANDIDATES_TO_TRY = 5
 MAX_PREVIOUS_VERSION_TRIES = 5
+MAX_CONCURRENT_FEED_PROBES = 3
 MAX_CACHED_FEEDS = 8
 REALTIME_DELAY_MAX_STALE_SECONDS = 300
 
@@ -64,11 +65,13 @@ WATCH_TYPE_DEPARTURE = "departure"
 WATCH_TYPE_OD = "od"
 WATCH_TYPE_NEARBY = "nearby"
 WATCH_TYPE_STATION_QUERY = "station_query"
-WATCH_TYPES = (
-    WATCH_TYPE_DEPARTURE,
-    WATCH_TYPE_OD,
-    WATCH_TYPE_NEARBY,
-    WATCH_TYPE_STATION_QUERY,
+WATCH_TYPES = frozenset(
+    {
+        WATCH_TYPE_DEPARTURE,
+        WATCH_TYPE_OD,
+        WATCH_TYPE_NEARBY,
+        WATCH_TYPE_STATION_QUERY,
+    }
 )
 WATCH_LOCATION_PERSON = "person"
 WATCH_LOCATION_ZONE = "zone"
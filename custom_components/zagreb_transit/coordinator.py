@@ -2,13 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field, fields, replace
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice, takewhile
+import heapq
 import logging
+from operator import itemgetter
+import random
 import re
+import sys
+from types import MappingProxyType
+from typing import Callable, Mapping
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components import persistent_notification
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers import entity_registry as er
@@ -56,7 +67,7 @@ from .const import (
     WATCH_TYPE_STATION_QUERY,
     WATCH_TYPES,
 )
-from .gtfs_index import GtfsIndex
+from .gtfs_index import GtfsIndex, local_epoch
 from .gtfs_store import FeedMeta, GtfsStore
 from .realtime import RealtimeClient
 
@@ -64,9 +75,125 @@ _LOGGER = logging.getLogger(__name__)
 
 STORE_VERSION = 1
 WATCH_STORE_VERSION = 1
+REALTIME_STORE_VERSION = 1
+WATCH_SAVE_DELAY = 10
+WATCH_SAVE_DELAY_STARTUP = 300
+SELECTION_SAVE_DELAY = 5
+INDEX_CACHE_SIZE = 2
 SIGNAL_WATCHES_CHANGED_BASE = f"{DOMAIN}_watches_changed"
 NOTIFICATION_ID_DEGRADED = f"{DOMAIN}_degraded"
 
+ROUTE_MODES = ("tram", "bus", "All")
+_VALID_MODES = frozenset(ROUTE_MODES)
+_VALID_LOCATION_SOURCES = frozenset((WATCH_LOCATION_PERSON, WATCH_LOCATION_ZONE, WATCH_LOCATION_FIXED))
+_LINE_RE = re.compile(r"\d+")
+# Shared placeholder options used until an index is loaded; never mutated.
+_EMPTY_OPTIONS = {
+    "route_modes": ROUTE_MODES,
+    "routes": (),
+    "od_directions": ("All",),
+    "from_stops": (),
+    "to_stops": (),
+    "stations": (),
+    "directions": ("All",),
+    "board_routes": ("All",),
+    "reference_persons": (),
+}
+
+# The nearby board can hold many stops; its sensor attributes keep a compact slice.
+_NEARBY_ATTR_MAX_STOPS = 4
+_NEARBY_ATTR_MAX_DEPARTURES_PER_STOP = 4
+_NEARBY_ATTR_DEPARTURE_KEYS = ("line", "direction", "minutes", "mode", "rt", "planned", "delay_minutes")
+_EMPTY_NEARBY_ATTRIBUTES = {
+    "reference_person": None,
+    "radius_meters": None,
+    "window_minutes": None,
+    "stops": (),
+    "stops_total": 0,
+    "departures_total": 0,
+    "attributes_truncated": False,
+}
+
+
+@dataclass(slots=True)
+class SelectionState:
+    """Current selector values; persisted as a plain dict in the state store."""
+
+    route_mode: str = "tram"
+    route: str | None = None
+    od_direction: str = "All"
+    from_stop: str | None = None
+    to_stop: str | None = None
+    station: str | None = None
+    direction: str = "All"
+    board_route: str = "All"
+    window_minutes: int = DEFAULT_WINDOW_MINUTES
+    reference_person: str | None = None
+    nearby_radius_meters: int = DEFAULT_NEARBY_RADIUS_METERS
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in SELECTION_FIELDS}
+
+    def update(self, data: dict) -> None:
+        """Apply known keys from a stored dict, ignoring anything unrecognised."""
+        for name in SELECTION_FIELDS:
+            if name in data:
+                setattr(self, name, data[name])
+
+
+SELECTION_FIELDS = tuple(item.name for item in fields(SelectionState))
+
+
+@dataclass(slots=True)
+class _Options:
+    """Typed config-entry options, refreshed only when the entry's options change."""
+
+    update_sec: int
+    realtime_sec: int
+    static_hours: int
+    default_window_minutes: int
+    notifications_enabled: bool
+
+    @classmethod
+    def from_entry(cls, entry: ConfigEntry) -> "_Options":
+        options = entry.options
+        return cls(
+            update_sec=int(options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)),
+            realtime_sec=int(options.get(CONF_REALTIME_INTERVAL, DEFAULT_REALTIME_INTERVAL)),
+            static_hours=int(options.get(CONF_STATIC_REFRESH_HOURS, DEFAULT_STATIC_REFRESH_HOURS)),
+            default_window_minutes=int(options.get(CONF_DEFAULT_WINDOW_MINUTES, DEFAULT_WINDOW_MINUTES)),
+            notifications_enabled=bool(options.get(CONF_NOTIFICATIONS_ENABLED, DEFAULT_NOTIFICATIONS_ENABLED)),
+        )
+
+
+@dataclass(slots=True)
+class _BuildInputs:
+    """Loop-side snapshot of everything _build_state reads."""
+
+    now: datetime
+    now_ts: float
+    integration_status: str
+    error_message: str | None
+    realtime_result: dict
+    realtime_backoff_multiplier: int
+    last_realtime_recovery_at: str | None
+    selection: SelectionState
+    reference_persons: list[str]
+    locations: dict[str, tuple[float | None, float | None]]
+    watches: list[tuple[str, dict]]
+    default_window_minutes: int
+    # Captured together on the loop so a concurrent index swap cannot mix two feeds in one build.
+    index: GtfsIndex | None
+    static_template: dict
+    opts_memo: dict[tuple, list[str]]
+    # Index query results shared by watches with identical arguments during one build.
+    eval_cache: dict[tuple, list[dict]] = field(default_factory=dict)
+    # Widest window of any station-board watch; each station board is fetched once at it.
+    board_window_minutes: int = 0
+
+    def index_options(self, method: str, *args) -> list[str]:
+        return _memo_index_options(self.index, self.opts_memo, method, args)
+
 
 class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
     """Main coordinator for Zagreb Transit."""
@@ -74,10 +201,17 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         self.hass = hass
         self.entry = entry
+        self._opts = _Options.from_entry(entry)
         self.session = async_get_clientsession(hass)
         self.gtfs_store = GtfsStore(hass, self.session)
-        self.realtime = RealtimeClient(self.session)
+        self.realtime = RealtimeClient(
+            hass, self.session, Store(hass, REALTIME_STORE_VERSION, f"{DOMAIN}.realtime.{entry.entry_id}")
+        )
         self.index: GtfsIndex | None = None
+        # (index, option memo) so lists built for an old index never land in the new one's memo.
+        self._opts_cache: tuple[GtfsIndex | None, dict[tuple, list[str]]] = (None, {})
+        self._index_cache: OrderedDict[tuple[str, str, str], GtfsIndex] = OrderedDict()
+        self._static_state_template: dict = {}
         self.active_feed: FeedMeta | None = None
         self.feed_source = "none"
         self.integration_status = "degraded"
@@ -87,31 +221,59 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
         self._last_realtime_refresh: datetime | None = None
         self._last_realtime_recovery_at: str | None = None
         self._realtime_backoff_multiplier = 1
+        # Full-jitter factor in [1, multiplier] so clients don't retry in lockstep.
+        self._realtime_backoff_jitter = 1.0
+        self._random = random.SystemRandom()
+        self._last_notifications_enabled: bool | None = None
 
+        # Store already encodes through Home Assistant's orjson-backed JSON helpers;
+        # payloads stay plain dicts/lists so no custom encoder slows that path down.
         self._state_store = Store(hass, STORE_VERSION, f"{DOMAIN}.state.{entry.entry_id}")
         self._watch_store = Store(hass, WATCH_STORE_VERSION, f"{DOMAIN}.watches.{entry.entry_id}")
         self._watch_registry: dict[str, dict] = {}
-
-        self.selection_state = {
-            "route_mode": "tram",
-            "route": None,
-            "od_direction": "All",
-            "from_stop": None,
-            "to_stop": None,
-            "station": None,
-            "direction": "All",
-            "board_route": "All",
-            "window_minutes": int(entry.options.get(CONF_DEFAULT_WINDOW_MINUTES, DEFAULT_WINDOW_MINUTES)),
-            "reference_person": None,
-            "nearby_radius_meters": DEFAULT_NEARBY_RADIUS_METERS,
+        self._watch_order: list[str] = []
+        self._watch_registry_rev = 0
+        # watch_key -> owning watch_id, kept in step with the registry for key allocation.
+        self._watch_key_owners: dict[str, str] = {}
+        # watch_id -> entity_id of the live watch sensor, maintained by the sensor platform.
+        self.watch_entity_ids: dict[str, str] = {}
+        # Watch outputs as of the last listener notification.
+        self._notified_watches: dict[str, dict] = {}
+        # Highest numeric suffix handed out as watch_<n>; new ids continue from here.
+        self._watch_id_seq = 0
+        self._last_build_key: tuple | None = None
+        self._build_lock = asyncio.Lock()
+        self._watch_evaluators = {
+            WATCH_TYPE_OD: self._eval_od_watch,
+            WATCH_TYPE_DEPARTURE: self._eval_departure_watch,
+            WATCH_TYPE_NEARBY: self._eval_nearby_watch,
+            WATCH_TYPE_STATION_QUERY: self._eval_station_query_watch,
         }
 
+        self.selection_state = SelectionState(
+            window_minutes=self._opts.default_window_minutes,
+        )
+
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(seconds=int(entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL))),
+            update_interval=timedelta(seconds=self._opts.update_sec),
+            # Unchanged builds return the same dict, so the equality check is usually an identity hit.
+            always_update=False,
         )
+        # Entities read coordinator.data before the first build; seed the shape they expect.
+        self.data = {
+            "watches": {},
+            "watch_ids": [],
+            "od_do": {},
+            "station_board": {},
+            "nearby_board": {"stops": []},
+            "nearby_board_attributes": _EMPTY_NEARBY_ATTRIBUTES,
+            "debug": {},
+        }
+        self._refresh_static_state_template()
+        entry.async_on_unload(entry.add_update_listener(self._async_options_updated))
 
     async def async_initialize(self) -> None:
         """Load state and bootstrap data."""
@@ -120,16 +282,34 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
             self.selection_state.update(cached)
 
         await self._async_load_watch_registry()
+        await self.realtime.async_load()
         await self.async_refresh_static(force=True)
         await self.async_refresh_realtime(force=True)
-        self.data = self._build_state()
+        self.data = await self._async_build_state()
+
+    async def _async_options_updated(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        self._opts = _Options.from_entry(entry)
+        self.update_interval = timedelta(seconds=self._opts.update_sec)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify listeners; watch sensors (context=watch_id) only when their watch output changed."""
+        watches = self.data.get("watches", {})
+        previous, self._notified_watches = self._notified_watches, watches
+        for update_callback, context in list(self._listeners.values()):
+            if context is not None and previous.get(context) == watches.get(context):
+                continue
+            update_callback()
 
     @property
     def watches_changed_signal(self) -> str:
         return f"{SIGNAL_WATCHES_CHANGED_BASE}_{self.entry.entry_id}"
 
     def watch_ids(self) -> list[str]:
-        return sorted(
+        return list(self._watch_order)
+
+    def _rebuild_watch_order(self) -> None:
+        self._watch_order = sorted(
             self._watch_registry.keys(),
             key=lambda watch_id: (
                 str(self._watch_registry[watch_id].get("created_at", "")),
@@ -142,16 +322,22 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
         return str(watch.get("watch_key") or watch_id)
 
     def watch_summaries(self) -> list[dict]:
-        return [
-            {
-                "watch_id": watch_id,
-                "watch_key": self.watch_entity_key(watch_id),
-                "name": self._watch_registry[watch_id].get("name"),
-                "type": self._watch_registry[watch_id].get("type"),
-                "enabled": self._watch_registry[watch_id].get("enabled", True),
-            }
-            for watch_id in self.watch_ids()
-        ]
+        rows: list[dict] = []
+        for watch_id in self.watch_ids():
+            watch = self._watch_registry[watch_id]
+            name = watch.get("name")
+            watch_type = watch.get("type")
+            rows.append(
+                {
+                    "watch_id": watch_id,
+                    "watch_key": self.watch_entity_key(watch_id),
+                    "name": name,
+                    "type": watch_type,
+                    "enabled": watch.get("enabled", True),
+                    "label": f"{name or watch_id} [{watch_type}]",
+                }
+            )
+        return rows
 
     def watch_by_id(self, watch_id: str) -> dict | None:
         watch = self._watch_registry.get(watch_id)
@@ -171,15 +357,44 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
         rows = stored.get("watches", []) if isinstance(stored, dict) else []
         for row in rows:
             watch = self._normalize_watch_dict(row)
-            if watch:
-                self._watch_registry[watch["watch_id"]] = watch
-
-    async def _async_save_watch_registry(self) -> None:
-        payload = {
-            "watches": [self._watch_registry[wid] for wid in self.watch_ids()],
+            if not watch:
+                continue
+            watch_id = watch["watch_id"]
+            # Owners must track the registry row by row: later rows allocate keys against it.
+            # A duplicate stored id overwrites its earlier row, which releases that row's key.
+            previous = self._watch_registry.get(watch_id)
+            if previous and self._watch_key_owners.get(previous["watch_key"]) == watch_id:
+                del self._watch_key_owners[previous["watch_key"]]
+            self._watch_registry[watch_id] = watch
+            self._watch_key_owners[watch["watch_key"]] = watch_id
+        self._watch_id_seq = max(
+            (
+                int(suffix)
+                for prefix, _sep, suffix in (wid.partition("_") for wid in self._watch_registry)
+                if prefix == "watch" and suffix.isdigit()
+            ),
+            default=0,
+        )
+        self._rebuild_watch_order()
+        self._watch_registry_rev += 1
+
+    @callback
+    def _schedule_save_watch_registry(self) -> None:
+        """Coalesce registry writes; bursts of watch edits produce a single save."""
+        delay = WATCH_SAVE_DELAY if self.hass.is_running else WATCH_SAVE_DELAY_STARTUP
+        self._watch_store.async_delay_save(self._watch_registry_payload, delay)
+
+    async def async_flush_stores(self) -> None:
+        """Write selection, watch registry and realtime delays now, superseding any pending delayed save."""
+        await self._state_store.async_save(self.selection_state.as_dict())
+        await self._watch_store.async_save(self._watch_registry_payload())
+        await self.realtime.async_save()
+
+    def _watch_registry_payload(self) -> dict:
+        return {
+            "watches": [self._watch_registry[wid] for wid in self._watch_order],
             "updated_at": dt_util.utcnow().isoformat(),
         }
-        await self._watch_store.async_save(payload)
 
     async def async_add_watch(self, name: str, watch_type: str, enabled: bool = True, config: dict | None = None) -> dict:
         """Add a new watch and trigger sensor update."""
@@ -202,8 +417,12 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
             "updated_at": now_iso,
         }
         self._watch_registry[watch_id] = watch
-        await self._async_save_watch_registry()
-        await self._async_refresh_outputs_and_notify(new_watch_id=watch_id)
+        self._watch_key_owners[watch_key] = watch_id
+        # New watches carry the newest created_at, so appending keeps the order sorted.
+        self._watch_order.append(watch_id)
+        self._watch_registry_rev += 1
+        self._schedule_save_watch_registry()
+        await self._async_refresh_outputs_and_notify()
         return watch
 
     async def async_update_watch(
@@ -222,9 +441,12 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
             old_name = watch.get("name", "")
             old_watch_key = str(watch.get("watch_key") or watch_id)
             watch["name"] = name.strip() or watch["watch_id"]
-            if slugify(old_name) != slugify(watch["name"]):
+            if _slugify_cached(old_name) != _slugify_cached(watch["name"]):
                 watch["watch_key"] = self._next_watch_key(watch["name"], exclude_watch_id=watch_id)
                 if watch["watch_key"] != old_watch_key:
+                    if self._watch_key_owners.get(old_watch_key) == watch_id:
+                        del self._watch_key_owners[old_watch_key]
+                    self._watch_key_owners[watch["watch_key"]] = watch_id
                     await self._async_remove_watch_entity(old_watch_key)
         if enabled is not None:
             watch["enabled"] = bool(enabled)
@@ -234,7 +456,8 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
             watch["config"] = self._normalize_watch_config(watch["type"], merged)
 
         watch["updated_at"] = dt_util.utcnow().isoformat()
-        await self._async_save_watch_registry()
+        self._watch_registry_rev += 1
+        self._schedule_save_watch_registry()
         await self._async_refresh_outputs_and_notify()
         return watch
 
@@ -243,9 +466,13 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
         if watch_id not in self._watch_registry:
             raise ValueError(f"watch_id not found: {watch_id}")
         removed = self._watch_registry.pop(watch_id)
+        self._watch_order.remove(watch_id)
         removed_watch_key = str(removed.get("watch_key") or watch_id)
+        if self._watch_key_owners.get(removed_watch_key) == watch_id:
+            del self._watch_key_owners[removed_watch_key]
         await self._async_remove_watch_entity(removed_watch_key)
-        await self._async_save_watch_registry()
+        self._watch_registry_rev += 1
+        self._schedule_save_watch_registry()
         await self._async_refresh_outputs_and_notify()
 
     async def async_duplicate_watch(self, watch_id: str, name_suffix: str = " Copy") -> dict:
@@ -261,10 +488,10 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
             config=dict(source.get("config", {})),
         )
 
-    async def _async_refresh_outputs_and_notify(self, new_watch_id: str | None = None) -> None:
-        self.data = self._build_state()
+    async def _async_refresh_outputs_and_notify(self) -> None:
+        self.data = await self._async_build_state()
         self.async_update_listeners()
-        async_dispatcher_send(self.hass, self.watches_changed_signal, new_watch_id)
+        async_dispatcher_send(self.hass, self.watches_changed_signal)
 
     async def _async_remove_watch_entity(self, watch_key: str) -> None:
         """Remove dynamic watch sensor from entity registry if it exists."""
@@ -275,7 +502,7 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
 
     async def async_refresh_static(self, force: bool = False) -> None:
         now = dt_util.now()
-        interval_hours = int(self.entry.options.get(CONF_STATIC_REFRESH_HOURS, DEFAULT_STATIC_REFRESH_HOURS))
+        interval_hours = self._opts.static_hours
 
         if not force and self._last_static_refresh and now - self._last_static_refresh < timedelta(hours=interval_hours):
             return
@@ -292,44 +519,52 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
 
         if not selected:
             self.active_feed = None
-            self.index = None
+            self._set_index(None)
             self.error_message = "No valid GTFS feed available"
             return
 
         self.active_feed = selected
-        payload = await self.gtfs_store.load_feed_bytes(selected)
-        self.index = GtfsIndex(payload)
+        self._set_index(await self._async_load_index(selected))
         self.error_message = None
         self._last_static_refresh = now
         self._sync_integration_status(now.date())
         self._apply_default_selection()
 
-    async def async_refresh_realtime(self, force: bool = False) -> None:
+    async def async_refresh_realtime(self, force: bool = False, resolve_status: bool = True) -> dict | None:
+        """Refresh realtime data; returns the result, or None when skipped by interval."""
         now = dt_util.now()
-        interval_sec = int(self.entry.options.get(CONF_REALTIME_INTERVAL, DEFAULT_REALTIME_INTERVAL))
-        effective_interval = interval_sec * self._realtime_backoff_multiplier
+        interval_sec = self._opts.realtime_sec
+        effective_interval = interval_sec * self._realtime_backoff_jitter
         if not force and self._last_realtime_refresh and now - self._last_realtime_refresh < timedelta(seconds=effective_interval):
-            return
+            return None
 
         result = await self.realtime.refresh()
         if result.get("status") == "ok":
             self._realtime_backoff_multiplier = 1
+            self._realtime_backoff_jitter = 1.0
+        else:
+            self._realtime_backoff_multiplier = min(self._realtime_backoff_multiplier * 2, 8)
+            self._realtime_backoff_jitter = self._random.uniform(1, self._realtime_backoff_multiplier)
+
+        self._last_realtime_refresh = now
+        if resolve_status:
+            self._resolve_realtime_status(result, now)
+        return result
+
+    def _resolve_realtime_status(self, result: dict, now: datetime) -> None:
+        if result.get("status") == "ok":
             if self.active_feed and self.active_feed.is_valid_for(now.date()):
                 self.integration_status = "ok"
                 self._last_realtime_recovery_at = now.isoformat()
         else:
-            self._realtime_backoff_multiplier = min(self._realtime_backoff_multiplier * 2, 8)
             self._sync_integration_status(now.date())
 
-        self._last_realtime_refresh = now
-
     async def async_rebuild_indexes(self) -> None:
         """Rebuild in-memory index from active feed."""
         if not self.active_feed:
             await self.async_refresh_static(force=True)
             return
-        payload = await self.gtfs_store.load_feed_bytes(self.active_feed)
-        self.index = GtfsIndex(payload)
+        self._set_index(await self._async_load_index(self.active_feed, force=True))
         self._apply_default_selection()
 
     async def async_validate_active_feed(self) -> None:
@@ -344,125 +579,258 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
 
         self.active_feed = meta
         self.feed_source = "forced"
-        payload = await self.gtfs_store.load_feed_bytes(meta)
-        self.index = GtfsIndex(payload)
+        self._set_index(await self._async_load_index(meta))
         self._apply_default_selection()
         return True
 
     async def async_set_selection(self, key: str, value) -> None:
         """Set selector state and refresh calculated outputs."""
-        self.selection_state[key] = value
+        if key not in SELECTION_FIELDS:
+            raise ValueError(f"Unknown selection key: {key}")
+        setattr(self.selection_state, key, value)
 
         if key == "route_mode":
-            self.selection_state["route"] = None
-            self.selection_state["od_direction"] = "All"
-            self.selection_state["from_stop"] = None
-            self.selection_state["to_stop"] = None
+            self.selection_state.route = None
+            self.selection_state.od_direction = "All"
+            self.selection_state.from_stop = None
+            self.selection_state.to_stop = None
         elif key == "route":
-            self.selection_state["od_direction"] = "All"
-            self.selection_state["from_stop"] = None
-            self.selection_state["to_stop"] = None
+            self.selection_state.od_direction = "All"
+            self.selection_state.from_stop = None
+            self.selection_state.to_stop = None
         elif key == "od_direction":
-            self.selection_state["from_stop"] = None
-            self.selection_state["to_stop"] = None
+            self.selection_state.from_stop = None
+            self.selection_state.to_stop = None
         elif key == "from_stop":
-            self.selection_state["to_stop"] = None
+            self.selection_state.to_stop = None
         elif key == "station":
-            self.selection_state["direction"] = "All"
-            self.selection_state["board_route"] = "All"
+            self.selection_state.direction = "All"
+            self.selection_state.board_route = "All"
 
-        await self._state_store.async_save(self.selection_state)
-        self.data = self._build_state()
+        self._state_store.async_delay_save(self.selection_state.as_dict, SELECTION_SAVE_DELAY)
+        self.data = await self._async_build_state()
         self.async_update_listeners()
 
     async def _async_update_data(self) -> dict:
         """Periodic coordinator update."""
+        now = dt_util.now()
+        # Static and realtime fetches are independent; realtime status is
+        # resolved after both finish so it never races the static refresh.
+        results = await asyncio.gather(
+            self.async_refresh_static(force=False),
+            self.async_refresh_realtime(force=False, resolve_status=False),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise UpdateFailed(str(result)) from result
+
         try:
-            await self.async_refresh_static(force=False)
-            await self.async_refresh_realtime(force=False)
-            return self._build_state()
+            realtime_result = results[1]
+            if realtime_result is not None:
+                self._resolve_realtime_status(realtime_result, now)
+            return await self._async_build_state()
         except Exception as err:  # noqa: BLE001
             raise UpdateFailed(str(err)) from err
 
+    async def _async_load_index(self, meta: FeedMeta, force: bool = False) -> GtfsIndex:
+        """Return the parsed index for a feed, reusing a recent parse of the same file."""
+        key = (meta.version, meta.file_path, meta.downloaded_at)
+        index = None if force else self._index_cache.get(key)
+        if index is None:
+            index = await self.hass.async_add_executor_job(
+                GtfsIndex.from_file_cached, meta.file_path, self.gtfs_store.index_cache_path(meta), meta.sha256
+            )
+            self._index_cache[key] = index
+        self._index_cache.move_to_end(key)
+        # Current feed plus the previous one is enough to absorb selection thrash.
+        while len(self._index_cache) > INDEX_CACHE_SIZE:
+            self._index_cache.popitem(last=False)
+        return index
+
+    def _set_index(self, index: GtfsIndex | None) -> None:
+        self.index = index
+        self._opts_cache = (index, {})
+        self._refresh_static_state_template()
+
+    def _refresh_static_state_template(self) -> None:
+        """Precompute state fields that only change when the active feed changes."""
+        feed = self.active_feed
+        self._static_state_template = {
+            "integration_version": VERSION,
+            ATTR_FEED_VERSION: feed.version if feed else "none",
+            ATTR_FEED_VALID_FROM: feed.start_date.isoformat() if feed and feed.start_date else None,
+            ATTR_FEED_VALID_TO: feed.end_date.isoformat() if feed and feed.end_date else None,
+            ATTR_FEED_SOURCE: self.feed_source,
+            "debug": {
+                **self.gtfs_store.debug,
+                "module_file_gtfs_store": getattr(gtfs_store_module, "__file__", None),
+                "feed_source": self.feed_source,
+            },
+        }
+
+    def _index_options(self, method: str, *args) -> list[str]:
+        """Return a memoized index option list; reset whenever the index changes."""
+        return _memo_index_options(self.index, self._opts_memo(), method, args)
+
+    def _opts_memo(self) -> dict[tuple, list[str]]:
+        memo_index, memo = self._opts_cache
+        if memo_index is not self.index:
+            memo = {}
+            self._opts_cache = (self.index, memo)
+        return memo
+
     def _apply_default_selection(self) -> None:
         if not self.index:
             return
 
-        route_mode = self.selection_state.get("route_mode") or "tram"
+        route_mode = self.selection_state.route_mode or "tram"
         if route_mode not in ("tram", "bus", "All"):
             route_mode = "tram"
-            self.selection_state["route_mode"] = route_mode
+            self.selection_state.route_mode = route_mode
 
-        routes = self.index.route_options(route_mode)
-        all_routes = self.index.route_options()
-        stations = self.index.station_options()
+        routes = self._index_options("route_options", route_mode)
+        all_routes = self._index_options("route_options")
+        stations = self._index_options("station_options")
 
-        route = self.selection_state.get("route")
+        route = self.selection_state.route
         if route not in routes:
             route = routes[0] if routes else None
-            self.selection_state["route"] = route
+            self.selection_state.route = route
 
         od_directions = ["All"]
         if route:
-            od_directions.extend(self.index.get_directions_for_route(route))
+            od_directions.extend(self._index_options("get_directions_for_route", route))
 
-        od_direction = self.selection_state.get("od_direction")
+        od_direction = self.selection_state.od_direction
         if od_direction not in od_directions:
             od_direction = "All"
-            self.selection_state["od_direction"] = od_direction
+            self.selection_state.od_direction = od_direction
 
-        from_candidates = self.index.get_stops_for_route(route, od_direction) if route else []
-        from_options = [stop for stop in from_candidates if self.index.get_to_stops(route, stop, od_direction)]
-        from_stop = self.selection_state.get("from_stop")
+        from_candidates = self._index_options("get_stops_for_route", route, od_direction) if route else []
+        from_options = [stop for stop in from_candidates if self.index.has_to_stops(route, stop, od_direction)]
+        from_stop = self.selection_state.from_stop
         if from_stop not in from_options:
             from_stop = from_options[0] if from_options else None
-            self.selection_state["from_stop"] = from_stop
+            self.selection_state.from_stop = from_stop
 
-        to_options = self.index.get_to_stops(route, from_stop, od_direction) if route and from_stop else []
-        to_stop = self.selection_state.get("to_stop")
+        to_options = self._index_options("get_to_stops", route, from_stop, od_direction) if route and from_stop else []
+        to_stop = self.selection_state.to_stop
         if to_stop not in to_options:
             to_stop = to_options[0] if to_options else None
-            self.selection_state["to_stop"] = to_stop
+            self.selection_state.to_stop = to_stop
 
-        station = self.selection_state.get("station")
+        station = self.selection_state.station
         if station not in stations:
             station = stations[0] if stations else None
-            self.selection_state["station"] = station
+            self.selection_state.station = station
 
-        directions = self.index.get_directions_for_station(station) if station else []
-        direction = self.selection_state.get("direction")
+        directions = self._index_options("get_directions_for_station", station) if station else []
+        direction = self.selection_state.direction
         if direction != "All" and direction not in directions:
-            self.selection_state["direction"] = "All"
+            self.selection_state.direction = "All"
 
-        board_route = self.selection_state.get("board_route")
+        board_route = self.selection_state.board_route
         if board_route != "All" and board_route not in all_routes:
-            self.selection_state["board_route"] = "All"
+            self.selection_state.board_route = "All"
+
+    async def _async_build_state(self) -> dict:
+        """Snapshot loop-only inputs, then build the state tree in the executor."""
+        inputs = self._snapshot_build_inputs()
+        realtime_result = inputs.realtime_result
+        # Everything the output depends on; minutes only shift once per wall-clock minute.
+        build_key = (
+            inputs.index,
+            # A forced feed can reuse a cached index while the feed metadata shown still changes.
+            self.active_feed,
+            self.feed_source,
+            inputs.selection,
+            inputs.reference_persons,
+            inputs.locations,
+            self._watch_registry_rev,
+            inputs.integration_status,
+            inputs.error_message,
+            realtime_result.get("status"),
+            realtime_result.get("last_timestamp"),
+            # New delays can arrive without a newer feed timestamp. Keep the mapping itself, not its id,
+            # so a freed dict's id cannot be reused; an identical mapping compares by identity first.
+            realtime_result.get("trip_delays"),
+            inputs.realtime_backoff_multiplier,
+            inputs.last_realtime_recovery_at,
+            inputs.default_window_minutes,
+            int(inputs.now.timestamp() // 60),
+        )
+        async with self._build_lock:
+            if self.data is not None and build_key == self._last_build_key:
+                return self.data
+            state = await self.hass.async_add_executor_job(self._build_state, inputs)
+            self._last_build_key = build_key
+            return state
 
-    def _build_state(self) -> dict:
-        now_local = dt_util.now().replace(tzinfo=None)
+    def _snapshot_build_inputs(self) -> _BuildInputs:
+        reference_persons: list[str] = []
+        if self.index:
+            reference_persons = sorted(st.entity_id for st in self.hass.states.async_all("person"))
+            selected_person = self.selection_state.reference_person
+            if selected_person not in reference_persons:
+                self.selection_state.reference_person = reference_persons[0] if reference_persons else None
+
+        selection = replace(self.selection_state)
+        watches = [(watch_id, dict(self._watch_registry[watch_id])) for watch_id in self._watch_order]
+
+        # State objects are only safe to read on the loop, so resolve every
+        # location the build may need up front, once per entity.
+        location_entities = {selection.reference_person}
+        for _watch_id, watch in watches:
+            if watch.get("type") == WATCH_TYPE_NEARBY and watch.get("enabled", True):
+                cfg = watch.get("config", {})
+                source_type = cfg.get("location_source_type", WATCH_LOCATION_PERSON)
+                location_entities.add(_location_entity(source_type, cfg, selection.reference_person))
+        locations: dict[str, tuple[float | None, float | None]] = {}
+        for entity_id in location_entities:
+            if not entity_id:
+                continue
+            st = self.hass.states.get(entity_id)
+            if st:
+                locations[entity_id] = (
+                    _to_float(st.attributes.get("latitude")),
+                    _to_float(st.attributes.get("longitude")),
+                )
 
+        now = dt_util.now()
+        return _BuildInputs(
+            now=now,
+            now_ts=local_epoch(now.replace(tzinfo=None)),
+            integration_status=self.integration_status,
+            error_message=self.error_message,
+            realtime_result=self.realtime.last_result,
+            realtime_backoff_multiplier=self._realtime_backoff_multiplier,
+            last_realtime_recovery_at=self._last_realtime_recovery_at,
+            selection=selection,
+            reference_persons=reference_persons,
+            locations=locations,
+            watches=watches,
+            default_window_minutes=self._opts.default_window_minutes,
+            index=self.index,
+            static_template=self._static_state_template,
+            opts_memo=self._opts_memo(),
+        )
+
+    def _build_state(self, inputs: _BuildInputs) -> dict:
+        """Build coordinator state; runs in the executor and reads only inputs."""
+        now_local = inputs.now.replace(tzinfo=None)
+        now_ts = inputs.now_ts
+        realtime_result = inputs.realtime_result
+
+        template = inputs.static_template
         state: dict = {
-            "status": self.integration_status,
-            "error": self.error_message,
-            "integration_version": VERSION,
-            ATTR_FEED_VERSION: self.active_feed.version if self.active_feed else "none",
-            ATTR_FEED_VALID_FROM: self.active_feed.start_date.isoformat() if self.active_feed and self.active_feed.start_date else None,
-            ATTR_FEED_VALID_TO: self.active_feed.end_date.isoformat() if self.active_feed and self.active_feed.end_date else None,
-            ATTR_FEED_SOURCE: self.feed_source,
-            ATTR_REALTIME_STATUS: self.realtime.last_result.get("status", "stale"),
-            ATTR_REALTIME_LAST_TIMESTAMP: self.realtime.last_result.get("last_timestamp"),
-            "options": {
-                "route_modes": ["tram", "bus", "All"],
-                "routes": [],
-                "od_directions": ["All"],
-                "from_stops": [],
-                "to_stops": [],
-                "stations": [],
-                "directions": ["All"],
-                "board_routes": ["All"],
-                "reference_persons": [],
-            },
-            "selection": dict(self.selection_state),
+            **template,
+            "status": inputs.integration_status,
+            "error": inputs.error_message,
+            ATTR_REALTIME_STATUS: realtime_result.get("status", "stale"),
+            ATTR_REALTIME_LAST_TIMESTAMP: realtime_result.get("last_timestamp"),
+            "options": _EMPTY_OPTIONS,
+            "selection": inputs.selection.as_dict(),
             "od_do": {
                 "state": "unavailable",
                 "upcoming": [],
@@ -475,58 +843,53 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
                 "state": 0,
                 "stops": [],
             },
+            "nearby_board_attributes": _EMPTY_NEARBY_ATTRIBUTES,
             "watches": {},
-            "watch_ids": self.watch_ids(),
+            "watch_ids": [watch_id for watch_id, _watch in inputs.watches],
             "debug": {
-                **self.gtfs_store.debug,
-                "module_file_gtfs_store": getattr(gtfs_store_module, "__file__", None),
-                "feed_source": self.feed_source,
-                "integration_status": self.integration_status,
+                **template["debug"],
+                "integration_status": inputs.integration_status,
                 "route_options_count": 0,
                 "station_options_count": 0,
-                "realtime_backoff_multiplier": self._realtime_backoff_multiplier,
-                "last_realtime_recovery_at": self._last_realtime_recovery_at,
-                "watch_registry_count": len(self._watch_registry),
+                "realtime_backoff_multiplier": inputs.realtime_backoff_multiplier,
+                "last_realtime_recovery_at": inputs.last_realtime_recovery_at,
+                "watch_registry_count": len(inputs.watches),
             },
         }
 
-        if not self.index:
+        if not inputs.index:
             return state
 
-        selection = dict(self.selection_state)
+        selection = inputs.selection
 
-        route_mode = selection.get("route_mode") or "tram"
-        routes = self.index.route_options(route_mode)
-        all_routes = self.index.route_options()
+        route_mode = selection.route_mode or "tram"
+        routes = inputs.index_options("route_options", route_mode)
+        all_routes = inputs.index_options("route_options")
         od_directions = ["All"]
-        if selection.get("route"):
-            od_directions.extend(self.index.get_directions_for_route(selection["route"]))
-        from_candidates = self.index.get_stops_for_route(selection.get("route"), selection.get("od_direction")) if selection.get("route") else []
+        if selection.route:
+            od_directions.extend(inputs.index_options("get_directions_for_route", selection.route))
+        from_candidates = inputs.index_options("get_stops_for_route", selection.route, selection.od_direction) if selection.route else []
         from_stops = [
             stop
             for stop in from_candidates
-            if self.index.get_to_stops(selection.get("route"), stop, selection.get("od_direction"))
+            if inputs.index.has_to_stops(selection.route, stop, selection.od_direction)
         ]
         to_stops = (
-            self.index.get_to_stops(selection.get("route"), selection.get("from_stop"), selection.get("od_direction"))
-            if selection.get("route") and selection.get("from_stop")
+            inputs.index_options("get_to_stops", selection.route, selection.from_stop, selection.od_direction)
+            if selection.route and selection.from_stop
             else []
         )
-        stations = self.index.station_options()
-        reference_persons = sorted([st.entity_id for st in self.hass.states.async_all("person")])
+        stations = inputs.index_options("station_options")
+        reference_persons = inputs.reference_persons
         directions = ["All"]
-        if selection.get("station"):
-            directions.extend(self.index.get_directions_for_station(selection["station"]))
+        if selection.station:
+            directions.extend(inputs.index_options("get_directions_for_station", selection.station))
         board_routes = ["All", *all_routes]
 
-        selected_person = selection.get("reference_person")
-        if selected_person not in reference_persons:
-            selected_person = reference_persons[0] if reference_persons else None
-            self.selection_state["reference_person"] = selected_person
-        selection["reference_person"] = selected_person
+        selected_person = selection.reference_person
 
         state["options"] = {
-            "route_modes": ["tram", "bus", "All"],
+            "route_modes": ROUTE_MODES,
             "routes": routes,
             "od_directions": od_directions,
             "from_stops": from_stops,
@@ -538,30 +901,29 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
         }
         state["debug"]["route_options_count"] = len(routes)
         state["debug"]["station_options_count"] = len(stations)
-        state["selection"] = dict(self.selection_state)
 
-        delays = self.realtime.last_result.get("trip_delays", {})
-        window_minutes = int(
-            selection.get("window_minutes")
-            or self.entry.options.get(CONF_DEFAULT_WINDOW_MINUTES, DEFAULT_WINDOW_MINUTES)
-        )
+        # Shared read-only view: every board and watch reads the same realtime dict without copying it.
+        delays = MappingProxyType(realtime_result.get("trip_delays", {}))
+        window_minutes = int(selection.window_minutes or inputs.default_window_minutes)
 
-        state["debug"]["ha_now"] = dt_util.now().isoformat()
-        state["debug"]["now_local"] = now_local.isoformat()
+        # Timestamp formatting is only worth paying for when someone is debugging.
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            state["debug"]["ha_now"] = inputs.now.isoformat()
+            state["debug"]["now_local"] = now_local.isoformat()
         state["debug"]["window_minutes"] = window_minutes
 
-        od_do_upcoming = self.index.upcoming_od_do(
+        od_do_upcoming = inputs.index.upcoming_od_do(
             now_local=now_local,
-            route_label=selection.get("route") or "",
-            direction_label=selection.get("od_direction") or "All",
-            from_stop_label=selection.get("from_stop") or "",
-            to_stop_label=selection.get("to_stop") or "",
+            route_label=selection.route or "",
+            direction_label=selection.od_direction or "All",
+            from_stop_label=selection.from_stop or "",
+            to_stop_label=selection.to_stop or "",
             delay_by_trip=delays,
             limit=8,
         )
         od_do_windowed: list[dict] = []
         for dep in od_do_upcoming:
-            minutes = _minutes_until(now_local, dep.get("departure_rt"))
+            minutes = _minutes_until(now_ts, dep.get("rt_epoch"))
             if minutes is None or minutes > window_minutes:
                 continue
             line = _extract_line_code(dep.get("route", ""))
@@ -583,7 +945,7 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
         elif od_do_upcoming:
             first = od_do_upcoming[0]
             line = _extract_line_code(first.get("route", ""))
-            next_minutes = _minutes_until(now_local, first.get("departure_rt"))
+            next_minutes = _minutes_until(now_ts, first.get("rt_epoch"))
             state["od_do"] = {
                 "state": "outside_window",
                 "route": first.get("route"),
@@ -600,40 +962,38 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
                 "next_minutes": next_minutes,
                 "upcoming": [],
             }
-        board_raw = self.index.station_direction_board(
+        board_raw = inputs.index.station_direction_board(
             now_local=now_local,
-            station_label=selection.get("station") or "",
-            direction_label=selection.get("direction") or "All",
-            board_route_label=selection.get("board_route") or "All",
+            station_label=selection.station or "",
+            direction_label=selection.direction or "All",
+            board_route_label=selection.board_route or "All",
             window_minutes=window_minutes,
             delay_by_trip=delays,
         )
         board: list[dict] = []
         for dep in board_raw:
             line = _extract_line_code(dep.get("route", ""))
-            minutes = _minutes_until(now_local, dep.get("rt"))
+            minutes = _minutes_until(now_ts, dep.get("rt_epoch"))
             if minutes is None:
                 continue
             board.append({**dep, "line": line, "minutes": minutes})
 
         state["station_board"] = {
             "state": len(board),
-            "stop": selection.get("station"),
-            "direction": selection.get("direction"),
-            "route": selection.get("board_route"),
+            "stop": selection.station,
+            "direction": selection.direction,
+            "route": selection.board_route,
             "window_minutes": window_minutes,
             "departures": board,
         }
 
-        radius_m = int(selection.get("nearby_radius_meters") or DEFAULT_NEARBY_RADIUS_METERS)
-        person_state = self.hass.states.get(selected_person) if selected_person else None
-        lat = person_state.attributes.get("latitude") if person_state else None
-        lon = person_state.attributes.get("longitude") if person_state else None
+        radius_m = int(selection.nearby_radius_meters or DEFAULT_NEARBY_RADIUS_METERS)
+        lat, lon = inputs.locations.get(selected_person, (None, None))
         if lat is not None and lon is not None:
-            nearby_raw = self.index.nearby_board(
+            nearby_raw = inputs.index.nearby_board(
                 now_local=now_local,
-                user_lat=float(lat),
-                user_lon=float(lon),
+                user_lat=lat,
+                user_lon=lon,
                 radius_meters=radius_m,
                 window_minutes=window_minutes,
                 delay_by_trip=delays,
@@ -644,13 +1004,13 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
                 deps: list[dict] = []
                 for dep in stop_row.get("departures", []):
                     line = _extract_line_code(dep.get("route", ""))
-                    minutes = _minutes_until(now_local, dep.get("rt"))
+                    minutes = _minutes_until(now_ts, dep.get("rt_epoch"))
                     if minutes is None:
                         continue
                     deps.append({**dep, "line": line, "minutes": minutes})
                 if not deps:
                     continue
-                deps.sort(key=lambda item: item.get("minutes", 9999))
+                deps.sort(key=itemgetter("minutes"))
                 nearby.append({**stop_row, "departures": deps})
 
             state["nearby_board"] = {
@@ -660,21 +1020,46 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
                 "window_minutes": window_minutes,
                 "stops": nearby,
             }
+            state["nearby_board_attributes"] = _nearby_board_attributes(state["nearby_board"])
 
-        watch_outputs: dict[str, dict] = {}
-        for watch_id in self.watch_ids():
-            watch = self._watch_registry[watch_id]
-            out = self._evaluate_watch(watch, now_local, delays, window_minutes)
-            watch_outputs[watch_id] = out
-        state["watches"] = watch_outputs
+        state["watches"] = self._evaluate_watches(inputs, now_local, delays, window_minutes)
 
         return state
 
+    def _evaluate_watches(
+        self,
+        inputs: _BuildInputs,
+        now_local: datetime,
+        delays: Mapping[str, int],
+        fallback_window_minutes: int,
+    ) -> dict[str, dict]:
+        """Evaluate all watches, grouped by type so each group resolves its evaluator once."""
+        groups: dict[str, list[tuple[str, dict]]] = defaultdict(list)
+        board_window = 0
+        for watch_id, watch in inputs.watches:
+            watch_type = watch.get("type")
+            groups[watch_type].append((watch_id, watch))
+            if watch_type in (WATCH_TYPE_DEPARTURE, WATCH_TYPE_STATION_QUERY) and watch.get("enabled", True):
+                window = watch.get("config", {}).get("window_minutes") or fallback_window_minutes
+                board_window = max(board_window, window)
+        inputs.board_window_minutes = board_window
+
+        outputs: dict[str, dict] = {}
+        for watch_type, watches in groups.items():
+            evaluator = self._watch_evaluators.get(watch_type)
+            for watch_id, watch in watches:
+                outputs[watch_id] = self._evaluate_watch(
+                    watch, evaluator, inputs, now_local, delays, fallback_window_minutes
+                )
+        return {watch_id: outputs[watch_id] for watch_id, _watch in inputs.watches}
+
     def _evaluate_watch(
         self,
         watch: dict,
+        evaluator,
+        inputs: _BuildInputs,
         now_local: datetime,
-        delays: dict[str, int],
+        delays: Mapping[str, int],
         fallback_window_minutes: int,
     ) -> dict:
         watch_type = watch.get("type")
@@ -694,145 +1079,200 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
         if not out["enabled"]:
             return out
 
-        try:
-            if watch_type == WATCH_TYPE_OD:
-                return self._eval_od_watch(out, cfg, now_local, delays, fallback_window_minutes)
-            if watch_type == WATCH_TYPE_DEPARTURE:
-                return self._eval_departure_watch(out, cfg, now_local, delays, fallback_window_minutes)
-            if watch_type == WATCH_TYPE_NEARBY:
-                return self._eval_nearby_watch(out, cfg, now_local, delays, fallback_window_minutes)
-            if watch_type == WATCH_TYPE_STATION_QUERY:
-                return self._eval_station_query_watch(out, cfg, now_local, delays, fallback_window_minutes)
+        if evaluator is None:
             out["error"] = f"unsupported watch type: {watch_type}"
             return out
+
+        try:
+            return evaluator(out, cfg, inputs, now_local, delays, fallback_window_minutes)
         except Exception as err:  # noqa: BLE001
             out["error"] = str(err)
             return out
 
-    def _eval_od_watch(self, out: dict, cfg: dict, now_local: datetime, delays: dict[str, int], fallback_window: int) -> dict:
-        from_query = str(cfg.get("from_query", "")).strip()
-        to_query = str(cfg.get("to_query", "")).strip()
+    def _watch_query(
+        self,
+        inputs: _BuildInputs,
+        method: str,
+        now_local: datetime,
+        delays: Mapping[str, int],
+        **kwargs,
+    ) -> list[dict]:
+        """Run an index query once per build for each distinct set of watch arguments."""
+        key = (method, *sorted(kwargs.items()))
+        cached = inputs.eval_cache.get(key)
+        if cached is None:
+            cached = getattr(inputs.index, method)(now_local=now_local, delay_by_trip=delays, **kwargs)
+            if method == "nearby_board":
+                for stop_row in cached:
+                    stop_row["departures"] = _annotate_departures(stop_row.get("departures", []), inputs.now_ts)
+            else:
+                cached = _annotate_departures(cached, inputs.now_ts)
+            inputs.eval_cache[key] = cached
+        return cached
+
+    def _station_boards(
+        self,
+        inputs: _BuildInputs,
+        now_local: datetime,
+        delays: Mapping[str, int],
+        station_queries: tuple[str, ...],
+        window_minutes: int,
+        max_stops: int,
+    ) -> list[dict]:
+        """Station boards for a watch, sharing each station's board across all watches."""
+        cache = inputs.eval_cache
+        stations_key = ("stations_matching_queries", station_queries, max_stops)
+        stations = cache.get(stations_key)
+        if stations is None:
+            stations = cache[stations_key] = inputs.index.stations_matching_queries(list(station_queries), max_stops=max_stops)
+
+        board_window = max(inputs.board_window_minutes, window_minutes)
+        cutoff = inputs.now_ts + window_minutes * 60
+        out: list[dict] = []
+        for station in stations:
+            board_key = ("station_direction_board", station, board_window)
+            board = cache.get(board_key)
+            if board is None:
+                board = cache[board_key] = _annotate_departures(
+                    inputs.index.station_direction_board(
+                        now_local=now_local,
+                        station_label=station,
+                        direction_label="All",
+                        board_route_label="All",
+                        window_minutes=board_window,
+                        delay_by_trip=delays,
+                    ),
+                    inputs.now_ts,
+                )
+            # Boards are in realtime order, so the watch's own window is a prefix.
+            if board_window > window_minutes:
+                departures = list(takewhile(lambda dep: dep["rt_epoch"] <= cutoff, board))
+            else:
+                departures = board
+            if departures:
+                out.append({"stop": station, "departures": departures})
+        return out
+
+    def _eval_od_watch(self, out: dict, cfg: dict, inputs: _BuildInputs, now_local: datetime, delays: Mapping[str, int], fallback_window: int) -> dict:
+        # cfg was normalized (typed, clamped, stripped) when the watch was stored.
+        from_query = cfg.get("from_query", "")
+        to_query = cfg.get("to_query", "")
         if not from_query or not to_query:
             out["error"] = "from_query and to_query are required"
             return out
 
-        window = _clamp_int(cfg.get("window_minutes"), fallback_window, MIN_WINDOW_MINUTES, MAX_WINDOW_MINUTES)
-        limit = _clamp_int(cfg.get("limit"), 20, MIN_WATCH_LIMIT, MAX_WATCH_LIMIT)
-        mode_filter = _normalize_mode(cfg.get("vehicle_type", cfg.get("mode", "All")))
-        route_filter = str(cfg.get("route_filter", "")).strip()
-        direction_filter = str(cfg.get("direction", "All")).strip()
-
-        deps = self.index.upcoming_between_stop_names(
-            now_local=now_local,
+        window = cfg.get("window_minutes") or fallback_window
+        limit = cfg.get("limit", 20)
+        mode_filter = cfg.get("vehicle_type", "All")
+        route_filter = cfg.get("route_filter", "")
+        direction_filter = cfg.get("direction", "All")
+        filter_direction = direction_filter not in ("", "All")
+
+        deps = self._watch_query(
+            inputs,
+            "upcoming_between_stop_names",
+            now_local,
+            delays,
             from_query=from_query,
             to_query=to_query,
             window_minutes=window,
-            delay_by_trip=delays,
             mode_filter=None if mode_filter == "All" else mode_filter,
             limit=limit,
         )
 
+        route_match = _make_route_filter(route_filter)
         filtered: list[dict] = []
         for dep in deps:
-            if direction_filter and direction_filter != "All" and dep.get("direction") != direction_filter:
+            if filter_direction and dep.get("direction") != direction_filter:
                 continue
-            line = _extract_line_code(dep.get("route", ""))
-            if route_filter and not _route_filter_match(route_filter, dep.get("route", ""), line):
+            if route_match and not route_match(dep.get("route", ""), dep["line"]):
                 continue
-            minutes = _minutes_until(now_local, dep.get("departure_rt"))
-            if minutes is None:
-                continue
-            filtered.append({**dep, "line": line, "minutes": minutes})
+            filtered.append(dep)
 
         out["window_minutes"] = window
         out["departures"] = filtered
         out["state"] = len(filtered)
         return out
 
-    def _eval_departure_watch(self, out: dict, cfg: dict, now_local: datetime, delays: dict[str, int], fallback_window: int) -> dict:
-        from_query = str(cfg.get("from_query", "")).strip()
+    def _eval_departure_watch(self, out: dict, cfg: dict, inputs: _BuildInputs, now_local: datetime, delays: Mapping[str, int], fallback_window: int) -> dict:
+        from_query = cfg.get("from_query", "")
         if not from_query:
             out["error"] = "from_query is required"
             return out
 
-        window = _clamp_int(cfg.get("window_minutes"), fallback_window, MIN_WINDOW_MINUTES, MAX_WINDOW_MINUTES)
-        limit = _clamp_int(cfg.get("limit"), 20, MIN_WATCH_LIMIT, MAX_WATCH_LIMIT)
-        max_stops = _clamp_int(cfg.get("max_stops"), 12, MIN_WATCH_MAX_STOPS, MAX_WATCH_MAX_STOPS)
-        mode_filter = _normalize_mode(cfg.get("vehicle_type", cfg.get("mode", "All")))
-        route_filter = str(cfg.get("route_filter", "")).strip()
-        direction_filter = str(cfg.get("direction", "All")).strip()
+        window = cfg.get("window_minutes") or fallback_window
+        limit = cfg.get("limit", 20)
+        max_stops = cfg.get("max_stops", 12)
+        mode_filter = cfg.get("vehicle_type", "All")
+        route_filter = cfg.get("route_filter", "")
+        direction_filter = cfg.get("direction", "All")
+        filter_direction = direction_filter not in ("", "All")
 
-        boards = self.index.boards_for_station_queries(
-            now_local=now_local,
-            station_queries=[from_query],
-            window_minutes=window,
-            delay_by_trip=delays,
-            max_stops=max_stops,
-        )
+        boards = self._station_boards(inputs, now_local, delays, (from_query,), window, max_stops)
 
-        departures: list[dict] = []
+        route_match = _make_route_filter(route_filter)
+        # Board rows are cached and shared with other watches, so they are not modified here.
+        candidates: list[tuple[dict, str | None]] = []
         for station in boards:
             stop = station.get("stop")
             for dep in station.get("departures", []):
                 if mode_filter != "All" and dep.get("mode") != mode_filter:
                     continue
-                if direction_filter and direction_filter != "All" and dep.get("direction") != direction_filter:
+                if filter_direction and dep.get("direction") != direction_filter:
                     continue
-                line = _extract_line_code(dep.get("route", ""))
-                if route_filter and not _route_filter_match(route_filter, dep.get("route", ""), line):
+                if route_match and not route_match(dep.get("route", ""), dep["line"]):
                     continue
-                minutes = _minutes_until(now_local, dep.get("rt"))
-                if minutes is None:
-                    continue
-                departures.append({**dep, "line": line, "minutes": minutes, "stop": stop})
+                candidates.append((dep, stop))
 
-        departures.sort(key=lambda item: item.get("minutes", 9999))
         out["window_minutes"] = window
-        out["departures"] = departures[:limit]
+        out["departures"] = [
+            {**dep, "stop": stop}
+            for dep, stop in heapq.nsmallest(limit, candidates, key=_candidate_minutes)
+        ]
         out["state"] = len(out["departures"])
         return out
 
-    def _eval_nearby_watch(self, out: dict, cfg: dict, now_local: datetime, delays: dict[str, int], fallback_window: int) -> dict:
-        source_type = str(cfg.get("location_source_type", WATCH_LOCATION_PERSON)).strip()
-        window = _clamp_int(cfg.get("window_minutes"), fallback_window, MIN_WINDOW_MINUTES, MAX_WINDOW_MINUTES)
-        radius = _clamp_int(cfg.get("radius_meters"), DEFAULT_NEARBY_RADIUS_METERS, MIN_NEARBY_RADIUS_METERS, MAX_NEARBY_RADIUS_METERS)
-        max_stops = _clamp_int(cfg.get("max_stops"), 8, 1, 20)
-        limit_per_stop = _clamp_int(cfg.get("limit_per_stop"), 6, 1, 30)
-        mode_filter = _normalize_mode(cfg.get("vehicle_type", cfg.get("mode", "All")))
+    def _eval_nearby_watch(self, out: dict, cfg: dict, inputs: _BuildInputs, now_local: datetime, delays: Mapping[str, int], fallback_window: int) -> dict:
+        source_type = cfg.get("location_source_type", WATCH_LOCATION_PERSON)
+        window = cfg.get("window_minutes") or fallback_window
+        radius = cfg.get("radius_meters", DEFAULT_NEARBY_RADIUS_METERS)
+        max_stops = cfg.get("max_stops", 8)
+        limit_per_stop = cfg.get("limit_per_stop", 6)
+        mode_filter = cfg.get("vehicle_type", "All")
 
-        lat, lon, source_label = self._resolve_location(source_type, cfg)
+        lat, lon, source_label = self._resolve_location(source_type, cfg, inputs)
         if lat is None or lon is None:
             out["error"] = f"location unavailable ({source_type})"
             return out
 
-        nearby = self.index.nearby_board(
-            now_local=now_local,
+        nearby = self._watch_query(
+            inputs,
+            "nearby_board",
+            now_local,
+            delays,
             user_lat=lat,
             user_lon=lon,
             radius_meters=radius,
             window_minutes=window,
-            delay_by_trip=delays,
             max_stops=max_stops,
         )
 
         rows: list[dict] = []
         total = 0
         for stop_row in nearby:
+            # Station boards come back ordered by realtime departure, so the first
+            # limit_per_stop matches are already the soonest ones.
             filtered_departures: list[dict] = []
             for dep in stop_row.get("departures", []):
                 if mode_filter != "All" and dep.get("mode") != mode_filter:
                     continue
-                line = _extract_line_code(dep.get("route", ""))
-                minutes = _minutes_until(now_local, dep.get("rt"))
-                if minutes is None:
-                    continue
-                filtered_departures.append({**dep, "line": line, "minutes": minutes})
+                filtered_departures.append(dep)
+                if len(filtered_departures) >= limit_per_stop:
+                    break
 
             if not filtered_departures:
                 continue
 
-            filtered_departures.sort(key=lambda item: item.get("minutes", 9999))
-            filtered_departures = filtered_departures[:limit_per_stop]
             total += len(filtered_departures)
             rows.append(
                 {
@@ -851,36 +1291,28 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
         out["stops"] = rows
         return out
 
-    def _eval_station_query_watch(self, out: dict, cfg: dict, now_local: datetime, delays: dict[str, int], fallback_window: int) -> dict:
-        queries = cfg.get("station_queries")
-        if isinstance(queries, str):
-            station_queries = [q.strip() for q in queries.split(",") if q.strip()]
-        elif isinstance(queries, list):
-            station_queries = [str(q).strip() for q in queries if str(q).strip()]
-        else:
-            station_queries = []
-
+    def _eval_station_query_watch(self, out: dict, cfg: dict, inputs: _BuildInputs, now_local: datetime, delays: Mapping[str, int], fallback_window: int) -> dict:
+        station_queries = cfg.get("station_queries") or []
         if not station_queries:
             out["error"] = "station_queries required"
             return out
 
-        window = _clamp_int(cfg.get("window_minutes"), fallback_window, MIN_WINDOW_MINUTES, MAX_WINDOW_MINUTES)
-        max_stops = _clamp_int(cfg.get("max_stops"), 12, MIN_WATCH_MAX_STOPS, MAX_WATCH_MAX_STOPS)
-        limit = _clamp_int(cfg.get("limit"), 20, MIN_WATCH_LIMIT, MAX_WATCH_LIMIT)
-        mode_filter = _normalize_mode(cfg.get("vehicle_type", cfg.get("mode", "All")))
-        route_filter = str(cfg.get("route_filter", "")).strip()
-        direction_filter = str(cfg.get("direction", "All")).strip()
+        window = cfg.get("window_minutes") or fallback_window
+        max_stops = cfg.get("max_stops", 12)
+        limit = cfg.get("limit", 20)
+        mode_filter = cfg.get("vehicle_type", "All")
+        route_filter = cfg.get("route_filter", "")
+        direction_filter = cfg.get("direction", "All")
+        filter_direction = direction_filter not in ("", "All")
 
-        boards = self.index.boards_for_station_queries(
-            now_local=now_local,
-            station_queries=station_queries,
-            window_minutes=window,
-            delay_by_trip=delays,
-            max_stops=max_stops,
-        )
+        boards = self._station_boards(inputs, now_local, delays, tuple(station_queries), window, max_stops)
 
+        route_match = _make_route_filter(route_filter)
         stations: list[dict] = []
-        grouped: dict[tuple[str, str], dict] = {}
+        # Per-(line, direction) aggregation as parallel lists indexed by group id.
+        group_index: dict[tuple[str, str], int] = {}
+        group_minutes: list[list[int]] = []
+        group_stops: list[set[str]] = []
         total = 0
 
         for station in boards:
@@ -889,44 +1321,43 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
             for dep in station.get("departures", []):
                 if mode_filter != "All" and dep.get("mode") != mode_filter:
                     continue
-                if direction_filter and direction_filter != "All" and dep.get("direction") != direction_filter:
+                if filter_direction and dep.get("direction") != direction_filter:
                     continue
-                line = _extract_line_code(dep.get("route", ""))
-                if route_filter and not _route_filter_match(route_filter, dep.get("route", ""), line):
-                    continue
-                minutes = _minutes_until(now_local, dep.get("rt"))
-                if minutes is None:
+                line = dep["line"]
+                if route_match and not route_match(dep.get("route", ""), line):
                     continue
 
-                row = {**dep, "line": line, "minutes": minutes}
-                deps_for_stop.append(row)
+                minutes = dep["minutes"]
+                deps_for_stop.append(dep)
                 total += 1
 
                 key = (line, dep.get("direction") or "Unknown")
-                if key not in grouped:
-                    grouped[key] = {
-                        "line": line,
-                        "direction": dep.get("direction") or "Unknown",
-                        "minutes": [],
-                        "stops": set(),
-                    }
-                grouped[key]["minutes"].append(minutes)
-                grouped[key]["stops"].add(stop)
+                gi = group_index.get(key)
+                if gi is None:
+                    gi = group_index[key] = len(group_minutes)
+                    group_minutes.append([])
+                    group_stops.append(set())
+                group_minutes[gi].append(minutes)
+                group_stops[gi].add(stop)
 
             if deps_for_stop:
-                deps_for_stop.sort(key=lambda item: item.get("minutes", 9999))
+                # Already in departure order from the station board.
                 stations.append({"stop": stop, "departures": deps_for_stop[:limit]})
 
+        # Numeric lines first in numeric order, then the rest; direction breaks ties.
+        ordered_groups = sorted(
+            group_index.items(),
+            key=lambda item: (int(item[0][0]) if item[0][0].isdecimal() else 9999, item[0][1]),
+        )
         grouped_rows = [
             {
-                "line": item["line"],
-                "direction": item["direction"],
-                "minutes": sorted(item["minutes"]),
-                "stops": sorted(item["stops"]),
+                "line": line,
+                "direction": direction,
+                "minutes": sorted(group_minutes[gi]),
+                "stops": sorted(group_stops[gi]),
             }
-            for item in grouped.values()
+            for (line, direction), gi in ordered_groups
         ]
-        grouped_rows.sort(key=lambda item: (int(item["line"]) if item["line"].isdigit() else 9999, item["direction"]))
 
         out["state"] = total
         out["window_minutes"] = window
@@ -935,28 +1366,13 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
         out["grouped"] = grouped_rows
         return out
 
-    def _resolve_location(self, source_type: str, cfg: dict) -> tuple[float | None, float | None, str | None]:
-        if source_type == WATCH_LOCATION_PERSON:
-            person_entity = str(cfg.get("person_entity") or self.selection_state.get("reference_person") or "").strip()
-            if not person_entity:
-                return None, None, None
-            st = self.hass.states.get(person_entity)
-            if not st:
-                return None, None, person_entity
-            lat = st.attributes.get("latitude")
-            lon = st.attributes.get("longitude")
-            return _to_float(lat), _to_float(lon), person_entity
-
-        if source_type == WATCH_LOCATION_ZONE:
-            zone_entity = str(cfg.get("zone_entity", "")).strip()
-            if not zone_entity:
+    def _resolve_location(self, source_type: str, cfg: dict, inputs: _BuildInputs) -> tuple[float | None, float | None, str | None]:
+        if source_type in (WATCH_LOCATION_PERSON, WATCH_LOCATION_ZONE):
+            entity_id = _location_entity(source_type, cfg, inputs.selection.reference_person)
+            if not entity_id:
                 return None, None, None
-            st = self.hass.states.get(zone_entity)
-            if not st:
-                return None, None, zone_entity
-            lat = st.attributes.get("latitude")
-            lon = st.attributes.get("longitude")
-            return _to_float(lat), _to_float(lon), zone_entity
+            lat, lon = inputs.locations.get(entity_id, (None, None))
+            return lat, lon, entity_id
 
         if source_type == WATCH_LOCATION_FIXED:
             lat = _to_float(cfg.get("fixed_lat"))
@@ -981,9 +1397,11 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
         self._handle_status_notification(previous_status, today)
 
     def _handle_status_notification(self, previous_status: str, today) -> None:
-        notifications_enabled = bool(
-            self.entry.options.get(CONF_NOTIFICATIONS_ENABLED, DEFAULT_NOTIFICATIONS_ENABLED)
-        )
+        notifications_enabled = self._opts.notifications_enabled
+        if previous_status == self.integration_status and notifications_enabled == self._last_notifications_enabled:
+            return
+        self._last_notifications_enabled = notifications_enabled
+
         if not notifications_enabled:
             persistent_notification.async_dismiss(self.hass, NOTIFICATION_ID_DEGRADED)
             return
@@ -1033,129 +1451,133 @@ class ZagrebTransitCoordinator(DataUpdateCoordinator[dict]):
         }
 
     def _normalize_watch_config(self, watch_type: str, config: dict) -> dict:
-        cfg = dict(config)
-
-        if watch_type == WATCH_TYPE_OD:
-            return {
-                "vehicle_type": _normalize_mode(cfg.get("vehicle_type", cfg.get("mode", "All"))),
-                "route_filter": str(cfg.get("route_filter", "")).strip(),
-                "direction": str(cfg.get("direction", "All")).strip() or "All",
-                "from_query": str(cfg.get("from_query", "")).strip(),
-                "to_query": str(cfg.get("to_query", "")).strip(),
-                "window_minutes": _clamp_int(cfg.get("window_minutes"), DEFAULT_WINDOW_MINUTES, MIN_WINDOW_MINUTES, MAX_WINDOW_MINUTES),
-                "limit": _clamp_int(cfg.get("limit"), 20, MIN_WATCH_LIMIT, MAX_WATCH_LIMIT),
-            }
-
-        if watch_type == WATCH_TYPE_DEPARTURE:
-            return {
-                "vehicle_type": _normalize_mode(cfg.get("vehicle_type", cfg.get("mode", "All"))),
-                "route_filter": str(cfg.get("route_filter", "")).strip(),
-                "direction": str(cfg.get("direction", "All")).strip() or "All",
-                "from_query": str(cfg.get("from_query", "")).strip(),
-                "window_minutes": _clamp_int(cfg.get("window_minutes"), DEFAULT_WINDOW_MINUTES, MIN_WINDOW_MINUTES, MAX_WINDOW_MINUTES),
-                "max_stops": _clamp_int(cfg.get("max_stops"), 12, MIN_WATCH_MAX_STOPS, MAX_WATCH_MAX_STOPS),
-                "limit": _clamp_int(cfg.get("limit"), 20, MIN_WATCH_LIMIT, MAX_WATCH_LIMIT),
-            }
-
-        if watch_type == WATCH_TYPE_NEARBY:
-            source_type = str(cfg.get("location_source_type", WATCH_LOCATION_PERSON)).strip()
-            if source_type not in {WATCH_LOCATION_PERSON, WATCH_LOCATION_ZONE, WATCH_LOCATION_FIXED}:
-                source_type = WATCH_LOCATION_PERSON
-            return {
-                "location_source_type": source_type,
-                "person_entity": str(cfg.get("person_entity", "")).strip(),
-                "zone_entity": str(cfg.get("zone_entity", "")).strip(),
-                "fixed_lat": _to_float(cfg.get("fixed_lat")),
-                "fixed_lon": _to_float(cfg.get("fixed_lon")),
-                "radius_meters": _clamp_int(cfg.get("radius_meters"), DEFAULT_NEARBY_RADIUS_METERS, MIN_NEARBY_RADIUS_METERS, MAX_NEARBY_RADIUS_METERS),
-                "vehicle_type": _normalize_mode(cfg.get("vehicle_type", cfg.get("mode", "All"))),
-                "window_minutes": _clamp_int(cfg.get("window_minutes"), DEFAULT_WINDOW_MINUTES, MIN_WINDOW_MINUTES, MAX_WINDOW_MINUTES),
-                "max_stops": _clamp_int(cfg.get("max_stops"), 8, 1, 20),
-                "limit_per_stop": _clamp_int(cfg.get("limit_per_stop"), 6, 1, 30),
-            }
-
-        if watch_type == WATCH_TYPE_STATION_QUERY:
-            station_queries = cfg.get("station_queries", [])
-            if isinstance(station_queries, str):
-                station_queries = [q.strip() for q in station_queries.split(",") if q.strip()]
-            elif isinstance(station_queries, list):
-                station_queries = [str(q).strip() for q in station_queries if str(q).strip()]
-            else:
-                station_queries = []
-            return {
-                "station_queries": station_queries,
-                "vehicle_type": _normalize_mode(cfg.get("vehicle_type", cfg.get("mode", "All"))),
-                "route_filter": str(cfg.get("route_filter", "")).strip(),
-                "direction": str(cfg.get("direction", "All")).strip() or "All",
-                "window_minutes": _clamp_int(cfg.get("window_minutes"), DEFAULT_WINDOW_MINUTES, MIN_WINDOW_MINUTES, MAX_WINDOW_MINUTES),
-                "max_stops": _clamp_int(cfg.get("max_stops"), 12, MIN_WATCH_MAX_STOPS, MAX_WATCH_MAX_STOPS),
-                "limit": _clamp_int(cfg.get("limit"), 20, MIN_WATCH_LIMIT, MAX_WATCH_LIMIT),
-            }
-
-        return cfg
+        normalizer = _WATCH_CONFIG_NORMALIZERS.get(watch_type)
+        return normalizer(config) if normalizer else dict(config)
 
     def _next_watch_id(self) -> str:
-        i = 1
-        while True:
-            candidate = f"watch_{i}"
-            if candidate not in self._watch_registry:
-                return candidate
+        i = self._watch_id_seq + 1
+        while f"watch_{i}" in self._watch_registry:
             i += 1
+        self._watch_id_seq = i
+        return f"watch_{i}"
 
     def _next_watch_key(self, name: str, exclude_watch_id: str | None = None) -> str:
         return self._normalize_watch_key("", name, exclude_watch_id=exclude_watch_id)
 
     def _normalize_watch_key(self, raw_key: str, name: str, exclude_watch_id: str | None = None) -> str:
-        base = slugify(raw_key.strip()) if raw_key.strip() else slugify(name.strip())
+        raw_key = raw_key.strip()
+        base = _slugify_cached(raw_key) if raw_key else _slugify_cached(name.strip())
         if not base:
             base = "watch"
         candidate = base
         suffix = 2
-        used = {
-            str(w.get("watch_key"))
-            for wid, w in self._watch_registry.items()
-            if wid != exclude_watch_id
-            if str(w.get("watch_key"))
-        }
-        while candidate in used:
+        owners = self._watch_key_owners
+        while candidate in owners and owners[candidate] != exclude_watch_id:
             candidate = f"{base}_{suffix}"
             suffix += 1
         return candidate
 
 
+@lru_cache(maxsize=512)
+def _slugify_cached(value: str) -> str:
+    return slugify(value)
+
+
+@lru_cache(maxsize=4096)
 def _extract_line_code(route_label: str) -> str:
     prefix = route_label.split("-", 1)[0].strip()
-    match = re.match(r"^(\d+)", prefix)
+    match = _LINE_RE.match(prefix)
     if match:
-        return match.group(1)
+        return match.group(0)
     return prefix or "?"
 
 
-def _minutes_until(now_local: datetime, rt_iso: str | None) -> int | None:
-    if not rt_iso:
+def _minutes_until(now_ts: float, rt_epoch: int | None) -> int | None:
+    if rt_epoch is None:
         return None
-    try:
-        dep_time = datetime.fromisoformat(rt_iso)
-    except ValueError:
-        return None
-    delta = dep_time - now_local
-    minutes = int(delta.total_seconds() // 60)
+    minutes = int((rt_epoch - now_ts) // 60)
     return minutes if minutes >= 0 else None
 
 
-def _route_filter_match(route_filter: str, route_label: str, line_code: str) -> bool:
+def _annotate_departures(departures: list[dict], now_ts: float) -> list[dict]:
+    """Stamp minutes and line code onto fetched departures once, dropping ones already gone."""
+    out: list[dict] = []
+    for dep in departures:
+        minutes = _minutes_until(now_ts, dep.get("rt_epoch"))
+        if minutes is None:
+            continue
+        dep["minutes"] = minutes
+        dep["line"] = _extract_line_code(dep.get("route", ""))
+        out.append(dep)
+    return out
+
+
+def _memo_index_options(index: GtfsIndex, memo: dict[tuple, list[str]], method: str, args: tuple) -> list[str]:
+    key = (method, *args)
+    cached = memo.get(key)
+    if cached is None:
+        cached = memo[key] = getattr(index, method)(*args)
+    return cached
+
+
+def _candidate_minutes(candidate: tuple[dict, str | None]) -> int:
+    return candidate[0]["minutes"]
+
+
+def _nearby_board_attributes(board: dict) -> dict:
+    raw_stops = board.get("stops", []) or []
+    total_departures = 0
+    truncated = len(raw_stops) > _NEARBY_ATTR_MAX_STOPS
+    for stop in raw_stops:
+        departures = stop.get("departures", []) or []
+        total_departures += len(departures)
+        if not truncated and len(departures) > _NEARBY_ATTR_MAX_DEPARTURES_PER_STOP:
+            truncated = True
+
+    return {
+        "reference_person": board.get("reference_person"),
+        "radius_meters": board.get("radius_meters"),
+        "window_minutes": board.get("window_minutes"),
+        "stops": [_compact_nearby_stop(stop) for stop in islice(raw_stops, _NEARBY_ATTR_MAX_STOPS)],
+        "stops_total": len(raw_stops),
+        "departures_total": total_departures,
+        "attributes_truncated": truncated,
+    }
+
+
+def _compact_nearby_stop(stop: dict) -> dict:
+    departures = stop.get("departures", []) or []
+    return {
+        "stop": stop.get("stop"),
+        "distance_meters": stop.get("distance_meters"),
+        "map_url": stop.get("map_url"),
+        "departures": [
+            {key: dep.get(key) for key in _NEARBY_ATTR_DEPARTURE_KEYS}
+            for dep in islice(departures, _NEARBY_ATTR_MAX_DEPARTURES_PER_STOP)
+        ],
+        "departures_total": len(departures),
+    }
+
+
+def _make_route_filter(route_filter: str) -> Callable[[str, str], bool] | None:
+    """Return a (route_label, line_code) matcher, or None when there is nothing to filter."""
     route_filter_l = route_filter.lower().strip()
     if not route_filter_l:
-        return True
+        return None
 
-    line_l = line_code.lower().strip()
-    if line_l == route_filter_l:
-        return True
+    def _match(route_label: str, line_code: str) -> bool:
+        # A "<filter> -" label prefix is a substring hit too, so one containment check covers it.
+        return line_code.lower().strip() == route_filter_l or route_filter_l in route_label.lower()
+
+    return _match
 
-    route_l = route_label.lower().strip()
-    if route_l.startswith(f"{route_filter_l} -"):
-        return True
-    return route_filter_l in route_l
+
+def _location_entity(source_type: str, cfg: dict, reference_person: str | None) -> str:
+    if source_type == WATCH_LOCATION_PERSON:
+        return str(cfg.get("person_entity") or reference_person or "").strip()
+    if source_type == WATCH_LOCATION_ZONE:
+        return str(cfg.get("zone_entity", "")).strip()
+    return ""
 
 
 def _to_float(value) -> float | None:
@@ -1169,14 +1591,86 @@ def _to_float(value) -> float | None:
 
 def _normalize_mode(value) -> str:
     raw = str(value or "All").strip()
-    if raw in {"tram", "bus", "All"}:
-        return raw
+    if raw in _VALID_MODES:
+        return sys.intern(raw)
     return "All"
 
 
 def _clamp_int(value, default: int, min_value: int, max_value: int) -> int:
-    try:
-        out = int(value)
-    except (TypeError, ValueError):
-        out = default
+    if type(value) is int:
+        out = value
+    else:
+        try:
+            out = int(value)
+        except (TypeError, ValueError):
+            out = default
     return max(min_value, min(max_value, out))
+
+
+def _normalize_od_config(cfg: dict) -> dict:
+    return {
+        "vehicle_type": _normalize_mode(cfg.get("vehicle_type", cfg.get("mode", "All"))),
+        "route_filter": str(cfg.get("route_filter", "")).strip(),
+        "direction": str(cfg.get("direction", "All")).strip() or "All",
+        "from_query": str(cfg.get("from_query", "")).strip(),
+        "to_query": str(cfg.get("to_query", "")).strip(),
+        "window_minutes": _clamp_int(cfg.get("window_minutes"), DEFAULT_WINDOW_MINUTES, MIN_WINDOW_MINUTES, MAX_WINDOW_MINUTES),
+        "limit": _clamp_int(cfg.get("limit"), 20, MIN_WATCH_LIMIT, MAX_WATCH_LIMIT),
+    }
+
+
+def _normalize_departure_config(cfg: dict) -> dict:
+    return {
+        "vehicle_type": _normalize_mode(cfg.get("vehicle_type", cfg.get("mode", "All"))),
+        "route_filter": str(cfg.get("route_filter", "")).strip(),
+        "direction": str(cfg.get("direction", "All")).strip() or "All",
+        "from_query": str(cfg.get("from_query", "")).strip(),
+        "window_minutes": _clamp_int(cfg.get("window_minutes"), DEFAULT_WINDOW_MINUTES, MIN_WINDOW_MINUTES, MAX_WINDOW_MINUTES),
+        "max_stops": _clamp_int(cfg.get("max_stops"), 12, MIN_WATCH_MAX_STOPS, MAX_WATCH_MAX_STOPS),
+        "limit": _clamp_int(cfg.get("limit"), 20, MIN_WATCH_LIMIT, MAX_WATCH_LIMIT),
+    }
+
+
+def _normalize_nearby_config(cfg: dict) -> dict:
+    source_type = str(cfg.get("location_source_type", WATCH_LOCATION_PERSON)).strip()
+    if source_type not in _VALID_LOCATION_SOURCES:
+        source_type = WATCH_LOCATION_PERSON
+    return {
+        "location_source_type": source_type,
+        "person_entity": str(cfg.get("person_entity", "")).strip(),
+        "zone_entity": str(cfg.get("zone_entity", "")).strip(),
+        "fixed_lat": _to_float(cfg.get("fixed_lat")),
+        "fixed_lon": _to_float(cfg.get("fixed_lon")),
+        "radius_meters": _clamp_int(cfg.get("radius_meters"), DEFAULT_NEARBY_RADIUS_METERS, MIN_NEARBY_RADIUS_METERS, MAX_NEARBY_RADIUS_METERS),
+        "vehicle_type": _normalize_mode(cfg.get("vehicle_type", cfg.get("mode", "All"))),
+        "window_minutes": _clamp_int(cfg.get("window_minutes"), DEFAULT_WINDOW_MINUTES, MIN_WINDOW_MINUTES, MAX_WINDOW_MINUTES),
+        "max_stops": _clamp_int(cfg.get("max_stops"), 8, 1, 20),
+        "limit_per_stop": _clamp_int(cfg.get("limit_per_stop"), 6, 1, 30),
+    }
+
+
+def _normalize_station_query_config(cfg: dict) -> dict:
+    station_queries = cfg.get("station_queries", [])
+    if isinstance(station_queries, str):
+        station_queries = [q.strip() for q in station_queries.split(",") if q.strip()]
+    elif isinstance(station_queries, list):
+        station_queries = [str(q).strip() for q in station_queries if str(q).strip()]
+    else:
+        station_queries = []
+    return {
+        "station_queries": station_queries,
+        "vehicle_type": _normalize_mode(cfg.get("vehicle_type", cfg.get("mode", "All"))),
+        "route_filter": str(cfg.get("route_filter", "")).strip(),
+        "direction": str(cfg.get("direction", "All")).strip() or "All",
+        "window_minutes": _clamp_int(cfg.get("window_minutes"), DEFAULT_WINDOW_MINUTES, MIN_WINDOW_MINUTES, MAX_WINDOW_MINUTES),
+        "max_stops": _clamp_int(cfg.get("max_stops"), 12, MIN_WATCH_MAX_STOPS, MAX_WATCH_MAX_STOPS),
+        "limit": _clamp_int(cfg.get("limit"), 20, MIN_WATCH_LIMIT, MAX_WATCH_LIMIT),
+    }
+
+
+_WATCH_CONFIG_NORMALIZERS = {
+    WATCH_TYPE_OD: _normalize_od_config,
+    WATCH_TYPE_DEPARTURE: _normalize_departure_config,
+    WATCH_TYPE_NEARBY: _normalize_nearby_config,
+    WATCH_TYPE_STATION_QUERY: _normalize_station_query_config,
+}
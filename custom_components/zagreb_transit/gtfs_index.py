@@ -2,19 +2,44 @@
 
 from __future__ import annotations
 
-from collections import defaultdict
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, defaultdict
 import csv
+import heapq
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+import hashlib
 import io
 import math
 import logging
+from operator import itemgetter
+import os
+from pathlib import Path
+import pickle
+import sys
 from typing import Any
 import zipfile
 
 _LOGGER = logging.getLogger(__name__)
 
 
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_EARTH_RADIUS_M = 6371000.0
+# Header of a pickled index: magic, format version, SHA-256 of the source zip.
+# Bump the format whenever the pickled attributes change shape.
+_INDEX_CACHE_MAGIC = b"ZTIX"
+_INDEX_CACHE_FORMAT = 12
+# Query caches that are rebuilt per process rather than pickled.
+_TRANSIENT_CACHES = ("_active_services_cache", "_delay_bounds_cache", "_board_cache")
+# Nearby-stop grid cell size (~550 m of latitude).
+_GEO_CELL_RAD = math.radians(0.005)
+
+_NO_DEPARTURES: tuple[list[str], array] = ([], array("i"))
+_BOARD_CACHE_SIZE = 256
+
 WEEKDAY_MAP = {
     0: "monday",
     1: "tuesday",
@@ -27,32 +52,135 @@ WEEKDAY_MAP = {
 
 
 @dataclass(slots=True)
-class StopTime:
-    stop_id: str
-    stop_sequence: int
-    departure_secs: int
-    arrival_secs: int
+class TripStopTimes:
+    """One trip's stop_times.txt rows as parallel columns in stop_sequence order."""
+
+    stop_ids: tuple[str, ...]
+    stop_sequences: array
+    departure_secs: array
+    arrival_secs: array
+
+
+_NO_STOP_TIMES = TripStopTimes((), array("i"), array("i"), array("i"))
+
+
+@dataclass(slots=True)
+class TripRecord:
+    """Per-route view of one trip with everything the route queries read."""
+
+    trip_id: str
+    headsign: str
+    service_id: str
+    stop_index: dict[str, int]
+    stop_times: TripStopTimes
 
 
 class GtfsIndex:
     """GTFS indexes for route/stop queries."""
 
-    def __init__(self, zip_payload: bytes) -> None:
+    def __init__(self, zip_source: bytes | str | Path) -> None:
         self.routes: dict[str, str] = {}
         self.route_types: dict[str, int] = {}
+        # route_id -> "tram" / "bus" / "other", resolved once from route_types.
+        self.route_mode: dict[str, str] = {}
         self.route_label_to_id: dict[str, str] = {}
         self.stops: dict[str, str] = {}
         self.stop_coords: dict[str, tuple[float, float]] = {}
+        # (stop_id, lat_rad, lon_rad, cos_lat) bucketed by lat/lon grid cell for nearby scans.
+        self._geo_grid: dict[tuple[int, int], list[tuple[str, float, float, float]]] = defaultdict(list)
         self.stop_label_to_id: dict[str, str] = {}
-        self.trips: dict[str, dict[str, str]] = {}
-        self.stop_times_by_trip: dict[str, list[StopTime]] = defaultdict(list)
+        self._stop_labels: dict[str, str] = {}
+        # Station labels in sorted order, with lowercase copies for query matching.
+        self._sorted_station_labels: tuple[str, ...] = ()
+        self._sorted_station_labels_lower: tuple[str, ...] = ()
+        # (stop_id, lowercased stop name) for substring lookups.
+        self._stop_names_lower: list[tuple[str, str]] = []
+        # Stop ids per raw stop query; the stops never change after load.
+        self._stop_query_cache: dict[str, frozenset[str]] = {}
+        # Trip attributes as parallel trip_id -> value maps; headsigns default to "Unknown".
+        self.trip_route_id: dict[str, str] = {}
+        self.trip_service_id: dict[str, str] = {}
+        self.trip_headsign: dict[str, str] = {}
+        self.stop_times_by_trip: dict[str, TripStopTimes] = {}
+        # trip_id -> {stop_id: position of its first visit in stop_times_by_trip[trip_id]}.
+        self._stop_index_by_trip: dict[str, dict[str, int]] = {}
         self.trips_by_route: dict[str, list[str]] = defaultdict(list)
-        self.departures_by_stop: dict[str, list[tuple[str, int]]] = defaultdict(list)
-        self.calendar: dict[str, dict[str, str]] = {}
+        # Route mode -> trip_ids in trips.txt order.
+        self.trips_by_mode: dict[str, list[str]] = defaultdict(list)
+        self.route_trip_records: dict[str, list[TripRecord]] = {}
+        # stop_id -> (trip_ids, dep_secs) as parallel columns sorted by dep_secs.
+        self.departures_by_stop: dict[str, tuple[list[str], array]] = {}
+        # stop_id -> (route_id, headsign) -> departure columns, for route/direction filtered boards.
+        self._departures_by_stop_group: dict[str, dict[tuple[str, str], tuple[list[str], array]]] = {}
+        # service_id -> (weekday bitmask, first ordinal, last ordinal) from calendar.txt.
+        self.calendar: dict[str, tuple[int, int, int]] = {}
         self.calendar_dates: dict[str, list[tuple[str, str]]] = defaultdict(list)
-        self._active_services_cache: dict = {}
-
-        self._load(zip_payload)
+        self._active_services_cache: OrderedDict[date, frozenset[str]] = OrderedDict()
+        # (delay mapping, (min delay, max delay)) for the most recent realtime snapshot.
+        self._delay_bounds_cache: tuple[Any, tuple[int, int]] | None = None
+        # (stop, direction, route, window, now) -> (delay mapping, rows) for recent boards.
+        self._board_cache: OrderedDict[tuple, tuple[Any, list[dict[str, Any]]]] = OrderedDict()
+        # (route_id, from_stop_id, direction) with at least one later stop; "All" covers any direction.
+        self._nonempty_to_stops: set[tuple[str, str, str]] = set()
+
+        self._load(zip_source)
+
+    @classmethod
+    def from_payload_cached(cls, zip_payload: bytes, cache_path: Path) -> GtfsIndex:
+        """Load a pickled index built from the same zip, or parse the zip and pickle it."""
+        return cls._from_cache_or_build(zip_payload, hashlib.sha256(zip_payload).digest(), cache_path)
+
+    @classmethod
+    def from_file_cached(cls, zip_path: str | Path, cache_path: Path, sha256: str = "") -> GtfsIndex:
+        """Like from_payload_cached for a zip on disk; the zip is never read into memory.
+
+        A known SHA-256 hex digest of the file skips hashing it.
+        """
+        zip_path = Path(zip_path)
+        if sha256:
+            digest = bytes.fromhex(sha256)
+        else:
+            with zip_path.open("rb") as handle:
+                digest = hashlib.file_digest(handle, "sha256").digest()
+        return cls._from_cache_or_build(zip_path, digest, cache_path)
+
+    @classmethod
+    def _from_cache_or_build(cls, zip_source: bytes | Path, digest: bytes, cache_path: Path) -> GtfsIndex:
+        header = _INDEX_CACHE_MAGIC + bytes((_INDEX_CACHE_FORMAT,)) + digest
+        try:
+            with cache_path.open("rb") as handle:
+                if handle.read(len(header)) == header:
+                    index = pickle.load(handle)
+                    if isinstance(index, cls):
+                        return index
+        except FileNotFoundError:
+            pass
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Ignoring unreadable GTFS index cache %s: %s", cache_path, err)
+
+        index = cls(zip_source)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.tmp")
+        try:
+            with tmp_path.open("wb") as handle:
+                handle.write(header)
+                pickle.dump(index, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Failed writing GTFS index cache %s: %s", cache_path, err)
+        return index
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for name in _TRANSIENT_CACHES:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        # Recreate the per-process caches here so cache files pickled before one existed still load.
+        self._active_services_cache = OrderedDict()
+        self._delay_bounds_cache = None
+        self._board_cache = OrderedDict()
 
     def route_options(self, mode_filter: str | None = None) -> list[str]:
         if not mode_filter or mode_filter == "All":
@@ -60,11 +188,11 @@ class GtfsIndex:
         return sorted(
             label
             for label, route_id in self.route_label_to_id.items()
-            if _route_mode(self.route_types.get(route_id)) == mode_filter
+            if self.route_mode.get(route_id, "other") == mode_filter
         )
 
     def station_options(self) -> list[str]:
-        return sorted(self.stop_label_to_id)
+        return list(self._sorted_station_labels)
 
     def get_stops_for_route(self, route_label: str, direction_label: str | None = None) -> list[str]:
         route_id = self.route_label_to_id.get(route_label)
@@ -72,14 +200,12 @@ class GtfsIndex:
             return []
 
         seq_min: dict[str, int] = {}
-        for trip_id in self.trips_by_route.get(route_id, []):
-            trip = self.trips.get(trip_id, {})
-            if direction_label and direction_label != "All":
-                headsign = trip.get("trip_headsign") or "Unknown"
-                if headsign != direction_label:
-                    continue
-            for st in self.stop_times_by_trip.get(trip_id, []):
-                seq_min[st.stop_id] = min(seq_min.get(st.stop_id, st.stop_sequence), st.stop_sequence)
+        for record in self.route_trip_records.get(route_id, ()):
+            if direction_label and direction_label != "All" and record.headsign != direction_label:
+                continue
+            stop_times = record.stop_times
+            for stop_id, seq in zip(stop_times.stop_ids, stop_times.stop_sequences):
+                seq_min[stop_id] = min(seq_min.get(stop_id, seq), seq)
 
         ordered = sorted(seq_min.items(), key=lambda item: item[1])
         return [self._stop_label(stop_id) for stop_id, _ in ordered]
@@ -91,31 +217,30 @@ class GtfsIndex:
             return []
 
         to_stops: set[str] = set()
-        for trip_id in self.trips_by_route.get(route_id, []):
-            trip = self.trips.get(trip_id, {})
-            if direction_label and direction_label != "All":
-                headsign = trip.get("trip_headsign") or "Unknown"
-                if headsign != direction_label:
-                    continue
-            stop_times = self.stop_times_by_trip.get(trip_id, [])
-            from_entry = next((st for st in stop_times if st.stop_id == from_stop), None)
-            if not from_entry:
+        for record in self.route_trip_records.get(route_id, ()):
+            if direction_label and direction_label != "All" and record.headsign != direction_label:
+                continue
+            from_idx = record.stop_index.get(from_stop)
+            if from_idx is None:
                 continue
-            for st in stop_times:
-                if st.stop_sequence > from_entry.stop_sequence:
-                    to_stops.add(self._stop_label(st.stop_id))
+            for stop_id in record.stop_times.stop_ids[from_idx + 1:]:
+                to_stops.add(self._stop_label(stop_id))
 
         return sorted(to_stops)
 
+    def has_to_stops(self, route_label: str, from_stop_label: str, direction_label: str | None = None) -> bool:
+        """Return whether get_to_stops would be non-empty, without building the list."""
+        route_id = self.route_label_to_id.get(route_label)
+        from_stop = self.stop_label_to_id.get(from_stop_label)
+        if not route_id or not from_stop:
+            return False
+        return (route_id, from_stop, direction_label or "All") in self._nonempty_to_stops
+
     def get_directions_for_route(self, route_label: str) -> list[str]:
         route_id = self.route_label_to_id.get(route_label)
         if not route_id:
             return []
-        directions: set[str] = set()
-        for trip_id in self.trips_by_route.get(route_id, []):
-            headsign = self.trips.get(trip_id, {}).get("trip_headsign") or "Unknown"
-            directions.add(headsign)
-        return sorted(directions)
+        return sorted({record.headsign for record in self.route_trip_records.get(route_id, ())})
 
     def get_directions_for_station(self, station_label: str) -> list[str]:
         stop_id = self.stop_label_to_id.get(station_label)
@@ -123,9 +248,9 @@ class GtfsIndex:
             return []
 
         directions: set[str] = set()
-        for trip_id, _ in self.departures_by_stop.get(stop_id, []):
-            headsign = self.trips.get(trip_id, {}).get("trip_headsign") or "Unknown"
-            directions.add(headsign)
+        trip_ids, _dep_secs = self.departures_by_stop.get(stop_id, _NO_DEPARTURES)
+        for trip_id in trip_ids:
+            directions.add(self.trip_headsign.get(trip_id, "Unknown"))
         return sorted(directions)
 
     def upcoming_od_do(
@@ -144,65 +269,70 @@ class GtfsIndex:
         if not route_id or not from_stop or not to_stop:
             return []
 
-        service_dates = [now_local.date() - timedelta(days=1), now_local.date(), now_local.date() + timedelta(days=1)]
-        active_services = {
-            d: self._active_services_for_day(d)
-            for d in service_dates
-        }
+        now_ts = local_epoch(now_local)
+        service_days = self._service_days(now_local)
 
-        results: list[dict[str, Any]] = []
-        for trip_id in self.trips_by_route.get(route_id, []):
-            headsign = self.trips.get(trip_id, {}).get("trip_headsign") or "Unknown"
+        # (rt_epoch, trip_id, headsign, planned_epoch, arrival_epoch, delay_seconds);
+        # rows are only formatted for the departures that survive the limit.
+        candidates: list[tuple[int, str, str, int, int, int]] = []
+        # Service-day overlap can yield the same trip departure twice; keep the first.
+        seen: set[tuple[str, int]] = set()
+        for record in self.route_trip_records.get(route_id, ()):
+            headsign = record.headsign
             if direction_label and direction_label != "All" and headsign != direction_label:
                 continue
-            service_id = self.trips.get(trip_id, {}).get("service_id")
-            if not service_id:
-                continue
+            trip_id = record.trip_id
+            service_id = record.service_id
 
-            stop_times = self.stop_times_by_trip.get(trip_id, [])
-            from_entry = next((st for st in stop_times if st.stop_id == from_stop), None)
-            to_entry = next((st for st in stop_times if st.stop_id == to_stop and from_entry and st.stop_sequence > from_entry.stop_sequence), None)
-            if not from_entry or not to_entry:
+            stop_index = record.stop_index
+            from_idx = stop_index.get(from_stop)
+            to_idx = stop_index.get(to_stop)
+            if from_idx is None or to_idx is None:
                 continue
+            stop_times = record.stop_times
+            if to_idx <= from_idx:
+                # The trip first reaches to_stop before from_stop; look for a later visit.
+                try:
+                    to_idx = stop_times.stop_ids.index(to_stop, from_idx + 1)
+                except ValueError:
+                    continue
+            departure_secs = stop_times.departure_secs[from_idx]
+            arrival_secs = stop_times.arrival_secs[to_idx]
 
-            for service_day, services in active_services.items():
+            for day_epoch, services in service_days:
                 if service_id not in services:
                     continue
 
-                dep_planned = self._time_for_service_day(service_day, from_entry.departure_secs)
-                arr_planned = self._time_for_service_day(service_day, to_entry.arrival_secs)
+                planned_epoch = day_epoch + departure_secs
+                arrival_epoch = day_epoch + arrival_secs
                 delay_seconds = int(delay_by_trip.get(trip_id, 0))
-                dep_rt = dep_planned + timedelta(seconds=delay_seconds)
-                arr_rt = arr_planned + timedelta(seconds=delay_seconds)
-                if dep_rt < now_local:
+                rt_epoch = planned_epoch + delay_seconds
+                if rt_epoch < now_ts:
                     continue
-
-                results.append(
-                    {
-                        "trip_id": trip_id,
-                        "route": route_label,
-                        "direction": headsign,
-                        "from_stop": from_stop_label,
-                        "to_stop": to_stop_label,
-                        "departure_planned": dep_planned.isoformat(),
-                        "departure_rt": dep_rt.isoformat(),
-                        "arrival_planned": arr_planned.isoformat(),
-                        "arrival_rt": arr_rt.isoformat(),
-                        "delay_minutes": round(delay_seconds / 60, 1),
-                    }
-                )
-
-        # Deduplicate potentially repeated rows across service-day overlap.
-        dedup: list[dict[str, Any]] = []
-        seen: set[tuple[str, str]] = set()
-        for item in sorted(results, key=lambda row: row["departure_rt"]):
-            key = (item.get("trip_id", ""), item.get("departure_rt", ""))
-            if key in seen:
-                continue
-            seen.add(key)
-            dedup.append(item)
-        results = dedup
-        return results[:limit]
+                key = (trip_id, rt_epoch)
+                if key in seen:
+                    continue
+                seen.add(key)
+                candidates.append((rt_epoch, trip_id, headsign, planned_epoch, arrival_epoch, delay_seconds))
+
+        candidates.sort(key=itemgetter(0))
+        return [
+            {
+                "trip_id": trip_id,
+                "route": route_label,
+                "direction": headsign,
+                "from_stop": from_stop_label,
+                "to_stop": to_stop_label,
+                "departure_planned": _iso_from_epoch(planned_epoch),
+                "departure_rt": _iso_from_epoch(rt_epoch),
+                "arrival_planned": _iso_from_epoch(arrival_epoch),
+                "arrival_rt": _iso_from_epoch(arrival_epoch + delay_seconds),
+                "planned_epoch": planned_epoch,
+                "rt_epoch": rt_epoch,
+                "delay_minutes": round(delay_seconds / 60, 1),
+            }
+            for rt_epoch, trip_id, headsign, planned_epoch, arrival_epoch, delay_seconds in candidates[:limit]
+        ]
 
     def station_direction_board(
         self,
@@ -217,55 +347,98 @@ class GtfsIndex:
         if not stop_id:
             return []
 
-        window_end = now_local + timedelta(minutes=window_minutes)
-        service_dates = [now_local.date() - timedelta(days=1), now_local.date(), now_local.date() + timedelta(days=1)]
-        active_services = {
-            d: self._active_services_for_day(d)
-            for d in service_dates
-        }
+        # Nearby and station-query boards often ask for the same stop within one
+        # refresh. Rows are handed out as copies because callers annotate them.
+        now_ts = local_epoch(now_local)
+        key = (stop_id, direction_label, board_route_label, window_minutes, now_ts)
+        cached = self._board_cache.get(key)
+        if cached is not None and cached[0] is delay_by_trip:
+            self._board_cache.move_to_end(key)
+            entries = cached[1]
+        else:
+            entries = self._build_station_board(
+                now_local, now_ts, stop_id, direction_label, board_route_label, window_minutes, delay_by_trip
+            )
+            self._board_cache[key] = (delay_by_trip, entries)
+            self._board_cache.move_to_end(key)
+            if len(self._board_cache) > _BOARD_CACHE_SIZE:
+                self._board_cache.popitem(last=False)
+        return [dict(entry) for entry in entries]
 
+    def _build_station_board(
+        self,
+        now_local: datetime,
+        now_ts: float,
+        stop_id: str,
+        direction_label: str,
+        board_route_label: str,
+        window_minutes: int,
+        delay_by_trip: dict[str, int],
+    ) -> list[dict[str, Any]]:
+        # Compare departures as epoch seconds; no datetime arithmetic per candidate.
+        window_end_ts = now_ts + window_minutes * 60
+        service_days = self._service_days(now_local)
+
+        filter_direction = bool(direction_label) and direction_label != "All"
+        filter_route = bool(board_route_label) and board_route_label != "All"
+        if filter_direction or filter_route:
+            # Only walk the (route, direction) buckets that can match.
+            sources = [
+                departures
+                for (route_id, headsign), departures in self._departures_by_stop_group.get(stop_id, {}).items()
+                if (not filter_direction or headsign == direction_label)
+                and (not filter_route or self.routes.get(route_id, route_id) == board_route_label)
+            ]
+        else:
+            sources = [self.departures_by_stop.get(stop_id, _NO_DEPARTURES)]
+
+        # Departure lists are sorted by dep_secs, so each service day only needs the
+        # slice that any known delay could still move into [now, window end].
+        min_delay, max_delay = self._delay_bounds(delay_by_trip)
         entries: list[dict[str, Any]] = []
-        for trip_id, dep_secs in self.departures_by_stop.get(stop_id, []):
-            trip = self.trips.get(trip_id, {})
-            service_id = trip.get("service_id")
-            if not service_id:
-                continue
-
-            headsign = trip.get("trip_headsign") or "Unknown"
-            if direction_label and direction_label != "All" and headsign != direction_label:
-                continue
-
-            for service_day, services in active_services.items():
-                if service_id not in services:
-                    continue
-
-                dep_planned = self._time_for_service_day(service_day, dep_secs)
-                delay_seconds = int(delay_by_trip.get(trip_id, 0))
-                dep_rt = dep_planned + timedelta(seconds=delay_seconds)
-
-                if dep_rt < now_local or dep_rt > window_end:
-                    continue
-
-                route_id = trip.get("route_id", "")
-                trip_route_label = self.routes.get(route_id, route_id)
-                if board_route_label and board_route_label != "All" and board_route_label != trip_route_label:
-                    continue
-
-                entries.append(
-                    {
-                        "trip_id": trip_id,
-                        "route": trip_route_label,
-                        "direction": headsign,
-                        "mode": _route_mode(self.route_types.get(route_id)),
-                        "planned": dep_planned.isoformat(),
-                        "rt": dep_rt.isoformat(),
-                        "delay_minutes": round(delay_seconds / 60, 1),
-                    }
-                )
-
-        entries.sort(key=lambda item: item["rt"])
+        for day_epoch, services in service_days:
+            lo_secs = now_ts - day_epoch - max_delay
+            hi_secs = window_end_ts - day_epoch - min_delay
+            for trip_ids, dep_secs_column in sources:
+                start = bisect_left(dep_secs_column, lo_secs)
+                end = bisect_right(dep_secs_column, hi_secs, lo=start)
+                for trip_id, dep_secs in zip(trip_ids[start:end], dep_secs_column[start:end]):
+                    service_id = self.trip_service_id.get(trip_id)
+                    if not service_id or service_id not in services:
+                        continue
+
+                    planned_epoch = day_epoch + dep_secs
+                    delay_seconds = int(delay_by_trip.get(trip_id, 0))
+                    rt_epoch = planned_epoch + delay_seconds
+                    if rt_epoch < now_ts or rt_epoch > window_end_ts:
+                        continue
+
+                    route_id = self.trip_route_id[trip_id]
+                    entries.append(
+                        {
+                            "trip_id": trip_id,
+                            "route": self.routes.get(route_id, route_id),
+                            "direction": self.trip_headsign[trip_id],
+                            "mode": self.route_mode.get(route_id, "other"),
+                            "planned": _iso_from_epoch(planned_epoch),
+                            "rt": _iso_from_epoch(planned_epoch + delay_seconds),
+                            "planned_epoch": planned_epoch,
+                            "rt_epoch": rt_epoch,
+                            "delay_minutes": round(delay_seconds / 60, 1),
+                        }
+                    )
+
+        entries.sort(key=itemgetter("rt_epoch"))
         return entries
 
+    def _trips_visiting(self, stop_ids: frozenset[str]) -> set[str]:
+        visiting: set[str] = set()
+        for stop_id in stop_ids:
+            columns = self.departures_by_stop.get(stop_id)
+            if columns is not None:
+                visiting.update(columns[0])
+        return visiting
+
     def upcoming_between_stop_names(
         self,
         now_local: datetime,
@@ -288,84 +461,115 @@ class GtfsIndex:
         if not from_ids or not to_ids:
             return []
 
-        window_end = now_local + timedelta(minutes=window_minutes)
-        service_dates = [now_local.date() - timedelta(days=1), now_local.date(), now_local.date() + timedelta(days=1)]
-        active_services = {d: self._active_services_for_day(d) for d in service_dates}
-
-        results: list[dict[str, Any]] = []
-        for trip_id, trip in self.trips.items():
-            route_id = trip.get("route_id", "")
-            route_mode = _route_mode(self.route_types.get(route_id))
-            if mode_filter and route_mode != mode_filter:
-                continue
+        # Compare departures as epoch seconds; no datetime arithmetic per candidate.
+        now_ts = local_epoch(now_local)
+        window_end_ts = now_ts + window_minutes * 60
+        service_days = self._service_days(now_local)
+
+        # (rt_epoch, trip_id, route_id, mode, from_stop_id, to_stop_id, planned, arrival, delay);
+        # rows are only formatted for the departures that survive the limit.
+        candidates: list[tuple[int, str, str, str, str, str, int, int, int]] = []
+        # Only trips stopping at both a from stop and a to stop can match.
+        visiting = self._trips_visiting(from_ids) & self._trips_visiting(to_ids)
+        if not visiting:
+            return []
 
-            service_id = trip.get("service_id")
-            if not service_id:
+        # Service-day overlap can yield the same trip departure twice; keep the first.
+        seen: set[tuple[str, int]] = set()
+        trip_route_id = self.trip_route_id
+        trip_service_id = self.trip_service_id
+        route_modes = self.route_mode
+        trip_ids = self.trips_by_mode.get(mode_filter, ()) if mode_filter else trip_route_id
+        for trip_id in trip_ids:
+            if trip_id not in visiting:
                 continue
+            route_id = trip_route_id[trip_id]
+            route_mode = route_modes.get(route_id, "other")
+            service_id = trip_service_id[trip_id]
 
-            stop_times = self.stop_times_by_trip.get(trip_id, [])
-            if not stop_times:
+            stop_index = self._stop_index_by_trip.get(trip_id)
+            if not stop_index:
                 continue
-
-            from_entry = next((st for st in stop_times if st.stop_id in from_ids), None)
-            if not from_entry:
+            from_idx = min((stop_index[stop_id] for stop_id in from_ids if stop_id in stop_index), default=None)
+            if from_idx is None:
                 continue
 
-            to_entry = next(
-                (st for st in stop_times if st.stop_id in to_ids and st.stop_sequence > from_entry.stop_sequence),
-                None,
-            )
-            if not to_entry:
+            stop_times = self.stop_times_by_trip[trip_id]
+            stop_ids = stop_times.stop_ids
+            to_idx = next((i for i in range(from_idx + 1, len(stop_ids)) if stop_ids[i] in to_ids), None)
+            if to_idx is None:
                 continue
+            departure_secs = stop_times.departure_secs[from_idx]
+            arrival_secs = stop_times.arrival_secs[to_idx]
 
-            for service_day, services in active_services.items():
+            for day_epoch, services in service_days:
                 if service_id not in services:
                     continue
 
-                dep_planned = self._time_for_service_day(service_day, from_entry.departure_secs)
-                arr_planned = self._time_for_service_day(service_day, to_entry.arrival_secs)
+                planned_epoch = day_epoch + departure_secs
+                arrival_epoch = day_epoch + arrival_secs
                 delay_seconds = int(delay_by_trip.get(trip_id, 0))
-                dep_rt = dep_planned + timedelta(seconds=delay_seconds)
-                arr_rt = arr_planned + timedelta(seconds=delay_seconds)
-
-                if dep_rt < now_local or dep_rt > window_end:
+                rt_epoch = planned_epoch + delay_seconds
+                if rt_epoch < now_ts or rt_epoch > window_end_ts:
                     continue
-
-                from_label = self._stop_label(from_entry.stop_id)
-                to_label = self._stop_label(to_entry.stop_id)
-                route_label = self.routes.get(route_id, route_id)
-                results.append(
-                    {
-                        "trip_id": trip_id,
-                        "route": route_label,
-                        "mode": route_mode,
-                        "direction": trip.get("trip_headsign") or "Unknown",
-                        "from_stop": from_label,
-                        "to_stop": to_label,
-                        "departure_planned": dep_planned.isoformat(),
-                        "departure_rt": dep_rt.isoformat(),
-                        "arrival_planned": arr_planned.isoformat(),
-                        "arrival_rt": arr_rt.isoformat(),
-                        "delay_minutes": round(delay_seconds / 60, 1),
-                    }
+                key = (trip_id, rt_epoch)
+                if key in seen:
+                    continue
+                seen.add(key)
+                candidates.append(
+                    (
+                        rt_epoch,
+                        trip_id,
+                        route_id,
+                        route_mode,
+                        stop_ids[from_idx],
+                        stop_ids[to_idx],
+                        planned_epoch,
+                        arrival_epoch,
+                        delay_seconds,
+                    )
                 )
 
-        dedup: list[dict[str, Any]] = []
-        seen: set[tuple[str, str]] = set()
-        for item in sorted(results, key=lambda row: row["departure_rt"]):
-            key = (item.get("trip_id", ""), item.get("departure_rt", ""))
-            if key in seen:
-                continue
-            seen.add(key)
-            dedup.append(item)
-        return dedup[:limit]
-
-    def _stop_ids_for_query(self, query: str) -> set[str]:
+        candidates.sort(key=itemgetter(0))
+        return [
+            {
+                "trip_id": trip_id,
+                "route": self.routes.get(route_id, route_id),
+                "mode": route_mode,
+                "direction": self.trip_headsign[trip_id],
+                "from_stop": self._stop_label(from_stop_id),
+                "to_stop": self._stop_label(to_stop_id),
+                "departure_planned": _iso_from_epoch(planned_epoch),
+                "departure_rt": _iso_from_epoch(rt_epoch),
+                "arrival_planned": _iso_from_epoch(arrival_epoch),
+                "arrival_rt": _iso_from_epoch(arrival_epoch + delay_seconds),
+                "planned_epoch": planned_epoch,
+                "rt_epoch": rt_epoch,
+                "delay_minutes": round(delay_seconds / 60, 1),
+            }
+            for (
+                rt_epoch,
+                trip_id,
+                route_id,
+                route_mode,
+                from_stop_id,
+                to_stop_id,
+                planned_epoch,
+                arrival_epoch,
+                delay_seconds,
+            ) in candidates[:limit]
+        ]
+
+    def _stop_ids_for_query(self, query: str) -> frozenset[str]:
         raw = (query or "").strip()
+        cached = self._stop_query_cache.get(raw)
+        if cached is not None:
+            return cached
+
         ql = raw.lower()
         out: set[str] = set()
         if not raw:
-            return out
+            return frozenset()
 
         # Exact full stop label match.
         exact = self.stop_label_to_id.get(raw)
@@ -379,11 +583,39 @@ class GtfsIndex:
                 out.add(maybe_id)
 
         # Fallback substring match by stop name.
-        for sid, name in self.stops.items():
-            if ql in name.lower():
-                out.add(sid)
-
-        return out
+        out.update(sid for sid, name_l in self._stop_names_lower if ql in name_l)
+
+        result = frozenset(out)
+        if len(self._stop_query_cache) >= 256:
+            self._stop_query_cache.clear()
+        self._stop_query_cache[raw] = result
+        return result
+
+    def _geo_candidates(self, lat_rad: float, lon_rad: float, max_dlat: float):
+        """Yield stops from the grid cells that can lie within max_dlat radians of arc."""
+        # Longitude span the radius can cover at the extreme latitude of the search band.
+        cos_min = math.cos(min(math.pi / 2, abs(lat_rad) + max_dlat))
+        sin_half = math.sin(max_dlat / 2.0)
+        if cos_min <= sin_half:
+            # Polar band: every longitude is in reach, so scan everything.
+            for stops in self._geo_grid.values():
+                yield from stops
+            return
+        max_dlon = 2.0 * math.asin(sin_half / cos_min)
+
+        lat_lo, lon_lo = _geo_cell(lat_rad - max_dlat, lon_rad - max_dlon)
+        lat_hi, lon_hi = _geo_cell(lat_rad + max_dlat, lon_rad + max_dlon)
+        if (lat_hi - lat_lo + 1) * (lon_hi - lon_lo + 1) > len(self._geo_grid):
+            for stops in self._geo_grid.values():
+                yield from stops
+            return
+
+        grid = self._geo_grid
+        for cell_lat in range(lat_lo, lat_hi + 1):
+            for cell_lon in range(lon_lo, lon_hi + 1):
+                stops = grid.get((cell_lat, cell_lon))
+                if stops:
+                    yield from stops
 
     def nearby_board(
         self,
@@ -396,16 +628,26 @@ class GtfsIndex:
         max_stops: int = 8,
     ) -> list[dict[str, Any]]:
         """Return nearby stops with departures for the selected window."""
+        user_lat_rad = math.radians(user_lat)
+        user_lon_rad = math.radians(user_lon)
+        cos_user = math.cos(user_lat_rad)
+        # Latitude difference alone bounds the distance, so most stops are rejected without trig.
+        max_dlat = radius_meters / _EARTH_RADIUS_M
+        # Compare the haversine term against the radius's own, so asin/sqrt only run for hits.
+        max_a = math.sin(min(max_dlat, math.pi) / 2.0) ** 2
+        sin = math.sin
         candidates: list[tuple[str, float]] = []
-        for stop_id, coords in self.stop_coords.items():
-            distance = _haversine_m(user_lat, user_lon, coords[0], coords[1])
-            if distance <= radius_meters:
-                candidates.append((stop_id, distance))
+        for stop_id, lat_rad, lon_rad, cos_lat in self._geo_candidates(user_lat_rad, user_lon_rad, max_dlat):
+            d_phi = lat_rad - user_lat_rad
+            if d_phi > max_dlat or d_phi < -max_dlat:
+                continue
+            a = sin(d_phi / 2.0) ** 2 + cos_user * cos_lat * sin((lon_rad - user_lon_rad) / 2.0) ** 2
+            if a <= max_a:
+                candidates.append((stop_id, _haversine_a_to_m(a)))
 
-        candidates.sort(key=lambda item: item[1])
         out: list[dict[str, Any]] = []
 
-        for stop_id, distance in candidates[:max(1, int(max_stops))]:
+        for stop_id, distance in heapq.nsmallest(max(1, int(max_stops)), candidates, key=lambda item: item[1]):
             stop_label = self._stop_label(stop_id)
             departures = self.station_direction_board(
                 now_local=now_local,
@@ -446,10 +688,10 @@ class GtfsIndex:
 
         seen: set[str] = set()
         matched: list[str] = []
-        stations = self.station_options()
+        stations = self._sorted_station_labels
         for query in clean_queries:
-            for station in stations:
-                if query in station.lower() and station not in seen:
+            for station, station_l in zip(stations, self._sorted_station_labels_lower):
+                if query in station_l and station not in seen:
                     seen.add(station)
                     matched.append(station)
                     if len(matched) >= max_stops:
@@ -485,26 +727,42 @@ class GtfsIndex:
                 )
         return out
 
-    def _time_for_service_day(self, service_day, value_secs: int) -> datetime:
-        return datetime.combine(service_day, datetime.min.time()) + timedelta(seconds=value_secs)
-
-    def _active_services_for_day(self, day) -> set[str]:
+    def _delay_bounds(self, delay_by_trip: dict[str, int]) -> tuple[int, int]:
+        """Most negative and most positive realtime delay, memoized per delay mapping."""
+        cached = self._delay_bounds_cache
+        if cached is not None and cached[0] is delay_by_trip:
+            return cached[1]
+        min_delay = max_delay = 0
+        for value in delay_by_trip.values():
+            delay = int(value)
+            if delay < min_delay:
+                min_delay = delay
+            elif delay > max_delay:
+                max_delay = delay
+        self._delay_bounds_cache = (delay_by_trip, (min_delay, max_delay))
+        return min_delay, max_delay
+
+    def _service_days(self, now_local: datetime) -> list[tuple[int, frozenset[str]]]:
+        """(midnight epoch, active service ids) for yesterday, today and tomorrow."""
+        today = now_local.date()
+        return [
+            (_service_day_epoch(day), self._active_services_for_day(day))
+            for day in (today - timedelta(days=1), today, today + timedelta(days=1))
+        ]
+
+    def _active_services_for_day(self, day) -> frozenset[str]:
         cached = self._active_services_cache.get(day)
         if cached is not None:
-            return set(cached)
-
-        services = set()
-        weekday = WEEKDAY_MAP[day.weekday()]
-
-        for service_id, row in self.calendar.items():
-            start = _yyyymmdd_to_date(row.get("start_date"))
-            end = _yyyymmdd_to_date(row.get("end_date"))
-            if start and day < start:
-                continue
-            if end and day > end:
-                continue
-            if row.get(weekday) == "1":
-                services.add(service_id)
+            self._active_services_cache.move_to_end(day)
+            return cached
+
+        weekday_bit = 1 << day.weekday()
+        day_ord = day.toordinal()
+        services = {
+            service_id
+            for service_id, (mask, start_ord, end_ord) in self.calendar.items()
+            if mask & weekday_bit and start_ord <= day_ord <= end_ord
+        }
 
         date_key = day.strftime("%Y%m%d")
         for service_id, exception_type in self.calendar_dates.get(date_key, []):
@@ -513,21 +771,23 @@ class GtfsIndex:
             elif exception_type == "2":
                 services.discard(service_id)
 
-        self._active_services_cache[day] = set(services)
+        frozen = frozenset(services)
+        self._active_services_cache[day] = frozen
         if len(self._active_services_cache) > 8:
-            newest_days = sorted(self._active_services_cache.keys())[-8:]
-            self._active_services_cache = {
-                k: self._active_services_cache[k]
-                for k in newest_days
-            }
-        return services
+            self._active_services_cache.popitem(last=False)
+        return frozen
 
     def _stop_label(self, stop_id: str) -> str:
-        name = self.stops.get(stop_id, stop_id)
-        return f"{name} [{stop_id}]"
-
-    def _load(self, zip_payload: bytes) -> None:
-        with zipfile.ZipFile(io.BytesIO(zip_payload)) as archive:
+        label = self._stop_labels.get(stop_id)
+        if label is None:
+            return f"{stop_id} [{stop_id}]"
+        return label
+
+    def _load(self, zip_source: bytes | str | Path) -> None:
+        # A path lets zipfile seek within the file instead of holding the whole zip in memory.
+        if isinstance(zip_source, bytes):
+            zip_source = io.BytesIO(zip_source)
+        with zipfile.ZipFile(zip_source) as archive:
             for row in _iter_csv(archive, "routes.txt"):
                 route_id = row.get("route_id")
                 if not route_id:
@@ -535,12 +795,14 @@ class GtfsIndex:
                 short = (row.get("route_short_name") or "").strip()
                 long = (row.get("route_long_name") or "").strip()
                 label = f"{short} - {long}".strip(" -") or route_id
+                label = sys.intern(label)
                 self.routes[route_id] = label
                 try:
                     self.route_types[route_id] = int((row.get("route_type") or "3").strip())
                 except ValueError:
                     self.route_types[route_id] = 3
                 self.route_label_to_id[label] = route_id
+            self.route_mode = {route_id: _route_mode(route_type) for route_id, route_type in self.route_types.items()}
 
             for row in _iter_csv(archive, "stops.txt"):
                 stop_id = row.get("stop_id")
@@ -548,7 +810,9 @@ class GtfsIndex:
                 if not stop_id or not stop_name:
                     continue
                 self.stops[stop_id] = stop_name
-                self.stop_label_to_id[f"{stop_name} [{stop_id}]"] = stop_id
+                label = sys.intern(f"{stop_name} [{stop_id}]")
+                self._stop_labels[stop_id] = label
+                self.stop_label_to_id[label] = stop_id
                 try:
                     lat = float(row.get("stop_lat") or "")
                     lon = float(row.get("stop_lon") or "")
@@ -556,48 +820,121 @@ class GtfsIndex:
                 except (TypeError, ValueError):
                     pass
 
-            for row in _iter_csv(archive, "trips.txt"):
-                trip_id = row.get("trip_id")
-                route_id = row.get("route_id")
-                service_id = row.get("service_id")
+            self._stop_names_lower = [(stop_id, name.lower()) for stop_id, name in self.stops.items()]
+            self._sorted_station_labels = tuple(sorted(self.stop_label_to_id))
+            self._sorted_station_labels_lower = tuple(label.lower() for label in self._sorted_station_labels)
+
+            for stop_id, (lat, lon) in self.stop_coords.items():
+                lat_rad = math.radians(lat)
+                lon_rad = math.radians(lon)
+                self._geo_grid[_geo_cell(lat_rad, lon_rad)].append(
+                    (stop_id, lat_rad, lon_rad, math.cos(lat_rad))
+                )
+
+            # Route, service and headsign values repeat across thousands of trips;
+            # interning shares one string per value through every result row.
+            intern = sys.intern
+            trip_columns = ("trip_id", "route_id", "service_id", "trip_headsign")
+            for trip_id, route_id, service_id, headsign in _iter_csv_columns(archive, "trips.txt", trip_columns):
                 if not trip_id or not route_id or not service_id:
                     continue
-                self.trips[trip_id] = {
-                    "route_id": route_id,
-                    "service_id": service_id,
-                    "trip_headsign": (row.get("trip_headsign") or "").strip(),
-                }
+                trip_id = intern(trip_id)
+                route_id = intern(route_id)
+                self.trip_route_id[trip_id] = route_id
+                self.trip_service_id[trip_id] = intern(service_id)
+                self.trip_headsign[trip_id] = intern(headsign.strip() or "Unknown")
                 self.trips_by_route[route_id].append(trip_id)
-
-            for row in _iter_csv(archive, "stop_times.txt"):
-                trip_id = row.get("trip_id")
-                stop_id = row.get("stop_id")
+                self.trips_by_mode[self.route_mode.get(route_id, "other")].append(trip_id)
+
+            # stop_times.txt is by far the largest file; read it as plain tuples.
+            trip_rows: dict[str, list[tuple[int, str, int, int]]] = defaultdict(list)
+            stop_departures: dict[str, list[tuple[str, int]]] = defaultdict(list)
+            stop_time_columns = ("trip_id", "stop_id", "departure_time", "arrival_time", "stop_sequence")
+            for trip_id, stop_id, departure_time, arrival_time, stop_sequence in _iter_csv_columns(
+                archive, "stop_times.txt", stop_time_columns
+            ):
                 if not trip_id or not stop_id:
                     continue
-                departure = _hhmmss_to_seconds(row.get("departure_time") or "")
-                arrival = _hhmmss_to_seconds(row.get("arrival_time") or "")
-                seq = int(row.get("stop_sequence") or 0)
-                stop_time = StopTime(
-                    stop_id=stop_id,
-                    stop_sequence=seq,
-                    departure_secs=departure,
-                    arrival_secs=arrival,
+                departure = _hhmmss_to_seconds(departure_time)
+                arrival = _hhmmss_to_seconds(arrival_time)
+                seq = int(stop_sequence or 0)
+                trip_id = intern(trip_id)
+                stop_id = intern(stop_id)
+                trip_rows[trip_id].append((seq, stop_id, departure, arrival))
+                stop_departures[stop_id].append((trip_id, departure))
+
+            # Keep each trip's stop times as int columns rather than one object per row.
+            for trip_id, rows in trip_rows.items():
+                rows.sort(key=itemgetter(0))
+                stop_ids = tuple(row[1] for row in rows)
+                self.stop_times_by_trip[trip_id] = TripStopTimes(
+                    stop_ids=stop_ids,
+                    stop_sequences=array("i", [row[0] for row in rows]),
+                    departure_secs=array("i", [row[2] for row in rows]),
+                    arrival_secs=array("i", [row[3] for row in rows]),
                 )
-                self.stop_times_by_trip[trip_id].append(stop_time)
-                self.departures_by_stop[stop_id].append((trip_id, departure))
-
-            for trip_id, items in self.stop_times_by_trip.items():
-                items.sort(key=lambda item: item.stop_sequence)
-                self.stop_times_by_trip[trip_id] = items
-
-            for stop_id, items in self.departures_by_stop.items():
+                stop_index: dict[str, int] = {}
+                for i, stop_id in enumerate(stop_ids):
+                    stop_index.setdefault(stop_id, i)
+                self._stop_index_by_trip[trip_id] = stop_index
+            del trip_rows
+
+            for route_id, trip_ids in self.trips_by_route.items():
+                self.route_trip_records[route_id] = [
+                    TripRecord(
+                        trip_id=trip_id,
+                        headsign=self.trip_headsign[trip_id],
+                        service_id=self.trip_service_id[trip_id],
+                        stop_index=self._stop_index_by_trip.get(trip_id, {}),
+                        stop_times=self.stop_times_by_trip.get(trip_id, _NO_STOP_TIMES),
+                    )
+                    for trip_id in trip_ids
+                ]
+
+            for stop_id, items in stop_departures.items():
                 items.sort(key=lambda item: item[1])
-                self.departures_by_stop[stop_id] = items
+                self.departures_by_stop[stop_id] = _departure_columns(items)
+                groups: dict[tuple[str, str], list[tuple[str, int]]] = defaultdict(list)
+                for item in items:
+                    trip_id = item[0]
+                    route_id = self.trip_route_id.get(trip_id)
+                    if route_id is not None:
+                        groups[(route_id, self.trip_headsign[trip_id])].append(item)
+                self._departures_by_stop_group[stop_id] = {
+                    key: _departure_columns(group) for key, group in groups.items()
+                }
+
+            for trip_id, route_id in self.trip_route_id.items():
+                stop_times = self.stop_times_by_trip.get(trip_id)
+                if stop_times is None:
+                    continue
+                headsign = self.trip_headsign[trip_id]
+                last_seq = stop_times.stop_sequences[-1]
+                seen: set[str] = set()
+                for stop_id, seq in zip(stop_times.stop_ids, stop_times.stop_sequences):
+                    # get_to_stops keys off the first visit of a stop within the trip.
+                    if stop_id in seen:
+                        continue
+                    seen.add(stop_id)
+                    if seq < last_seq:
+                        self._nonempty_to_stops.add((route_id, stop_id, headsign))
+                        self._nonempty_to_stops.add((route_id, stop_id, "All"))
 
             for row in _iter_csv(archive, "calendar.txt"):
                 service_id = row.get("service_id")
-                if service_id:
-                    self.calendar[service_id] = row
+                if not service_id:
+                    continue
+                mask = 0
+                for bit, weekday in WEEKDAY_MAP.items():
+                    if row.get(weekday) == "1":
+                        mask |= 1 << bit
+                start = _yyyymmdd_to_date(row.get("start_date"))
+                end = _yyyymmdd_to_date(row.get("end_date"))
+                self.calendar[intern(service_id)] = (
+                    mask,
+                    start.toordinal() if start else 0,
+                    end.toordinal() if end else date.max.toordinal(),
+                )
 
             for row in _iter_csv(archive, "calendar_dates.txt"):
                 service_id = row.get("service_id")
@@ -610,21 +947,66 @@ class GtfsIndex:
             "GTFS index loaded routes=%d stops=%d trips=%d",
             len(self.routes),
             len(self.stops),
-            len(self.trips),
+            len(self.trip_route_id),
         )
 
 
-def _iter_csv(archive: zipfile.ZipFile, filename: str):
-    members = archive.namelist()
-    target = next(
-        (name for name in members if name.lower().endswith(f"/{filename.lower()}") or name.lower() == filename.lower()),
+def _departure_columns(items: list[tuple[str, int]]) -> tuple[list[str], array]:
+    return [trip_id for trip_id, _ in items], array("i", [dep_secs for _, dep_secs in items])
+
+
+def _find_member(archive: zipfile.ZipFile, filename: str) -> str | None:
+    filename_l = filename.lower()
+    return next(
+        (name for name in archive.namelist() if name.lower().endswith(f"/{filename_l}") or name.lower() == filename_l),
         None,
     )
+
+
+def _iter_csv(archive: zipfile.ZipFile, filename: str):
+    target = _find_member(archive, filename)
+    if not target:
+        return
+    with archive.open(target) as handle:
+        yield from csv.DictReader(io.TextIOWrapper(handle, encoding="utf-8-sig", errors="replace", newline=""))
+
+
+def _iter_csv_columns(archive: zipfile.ZipFile, filename: str, columns: tuple[str, ...]):
+    """Stream a CSV member as tuples of the named columns; absent columns and cells read as ""."""
+    target = _find_member(archive, filename)
     if not target:
-        return []
+        return
     with archive.open(target) as handle:
-        text = handle.read().decode("utf-8-sig", errors="replace")
-    return csv.DictReader(io.StringIO(text))
+        reader = csv.reader(io.TextIOWrapper(handle, encoding="utf-8-sig", errors="replace", newline=""))
+        header = next(reader, None)
+        if header is None:
+            return
+        positions = {name.strip(): i for i, name in enumerate(header)}
+        # One slot past the header is always padding, so absent columns point there.
+        width = len(header) + 1
+        pick = itemgetter(*(positions.get(column, len(header)) for column in columns))
+        padding = [""] * width
+        for row in reader:
+            if len(row) < width:
+                row.extend(padding[len(row):])
+            yield pick(row)
+
+
+def _service_day_epoch(service_day: date) -> int:
+    return (service_day.toordinal() - _EPOCH_ORDINAL) * 86400
+
+
+@lru_cache(maxsize=8192)
+def _iso_from_epoch(epoch: int) -> str:
+    """ISO string for a naive-local epoch; departure times repeat across stops and ticks."""
+    return (_NAIVE_EPOCH + timedelta(seconds=epoch)).isoformat()
+
+
+def local_epoch(value: datetime) -> float:
+    """Seconds since 1970-01-01 for a naive local datetime, matching the *_epoch result fields."""
+    return (value.toordinal() - _EPOCH_ORDINAL) * 86400 + (
+        value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / 1_000_000
+    )
 
 
 def _hhmmss_to_seconds(value: str) -> int:
@@ -649,17 +1031,12 @@ def _yyyymmdd_to_date(value: str | None):
         return None
 
 
-def _haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    r = 6371000.0
-    phi1 = math.radians(lat1)
-    phi2 = math.radians(lat2)
-    d_phi = math.radians(lat2 - lat1)
-    d_lambda = math.radians(lon2 - lon1)
-    a = (
-        math.sin(d_phi / 2.0) ** 2
-        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2.0) ** 2
-    )
-    return 2.0 * r * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+def _geo_cell(lat_rad: float, lon_rad: float) -> tuple[int, int]:
+    return math.floor(lat_rad / _GEO_CELL_RAD), math.floor(lon_rad / _GEO_CELL_RAD)
+
+
+def _haversine_a_to_m(a: float) -> float:
+    return 2.0 * _EARTH_RADIUS_M * math.asin(math.sqrt(min(1.0, a)))
 
 
 def _route_mode(route_type: int | None) -> str:
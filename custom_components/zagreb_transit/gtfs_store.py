@@ -2,26 +2,34 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import date, datetime
+import asyncio
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timezone
+from functools import lru_cache
 import csv
 import hashlib
 import io
-import json
 import logging
+import os
 import re
+import time
 from pathlib import Path
+from typing import BinaryIO
 from urllib.parse import urljoin, urlparse
+import uuid
 import zipfile
 
-from aiohttp import ClientSession
+from aiohttp import ClientResponse, ClientSession
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads
 
 from .const import (
     DOMAIN,
     GTFS_LISTING_URL,
     GTFS_PORTAL_URL,
     MAX_CACHED_FEEDS,
+    MAX_CONCURRENT_FEED_PROBES,
     MAX_LISTING_CANDIDATES_TO_TRY,
     MAX_PREVIOUS_VERSION_TRIES,
     STATIC_GTFS_URL,
@@ -29,6 +37,11 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+_WRITE_BATCH_SIZE = 1024 * 1024
+_STALE_PART_SECONDS = 3600
+_HREF_RE = re.compile(r'href=["\']([^"\']+)["\']', re.IGNORECASE)
+
 
 def _safe_version(value: str) -> str:
     return re.sub(r"[^a-zA-Z0-9_.-]", "_", value)
@@ -43,11 +56,27 @@ def _parse_date(value: str | None) -> date | None:
         return None
 
 
+def _write_batch(handle: BinaryIO, hasher, batch: bytearray) -> None:
+    hasher.update(batch)
+    handle.write(batch)
+
+
+def _unlink_quietly(path: Path) -> None:
+    try:
+        path.unlink(missing_ok=True)
+    except OSError as err:
+        _LOGGER.debug("Failed removing %s: %s", path, err)
+
+
+@lru_cache(maxsize=64)
+def _iso_to_date(value: str) -> date:
+    # Feeds share a handful of validity dates; dates are immutable, so reuse them.
+    return date.fromisoformat(value)
+
+
 def _meta_rank(meta: "FeedMeta") -> tuple[int, date]:
     """Rank feed recency. Higher is newer."""
-    version_rank = int(meta.version) if meta.version.isdigit() else -1
-    start_rank = meta.start_date or date.min
-    return (version_rank, start_rank)
+    return meta._rank
 
 
 @dataclass(slots=True)
@@ -60,6 +89,14 @@ class FeedMeta:
     file_path: str
     source: str
     downloaded_at: str
+    # SHA-256 of the zip; empty for feeds cached before it was recorded.
+    sha256: str = ""
+    # Recency rank used by _meta_rank; derived from version and start_date once.
+    _rank: tuple[int, date] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        version_rank = int(self.version) if self.version.isdigit() else -1
+        self._rank = (version_rank, self.start_date or date.min)
 
     @property
     def valid_range(self) -> str:
@@ -82,12 +119,13 @@ class FeedMeta:
             "file_path": self.file_path,
             "source": self.source,
             "downloaded_at": self.downloaded_at,
+            "sha256": self.sha256,
         }
 
     @classmethod
     def from_dict(cls, raw: dict) -> "FeedMeta":
-        start = date.fromisoformat(raw["start_date"]) if raw.get("start_date") else None
-        end = date.fromisoformat(raw["end_date"]) if raw.get("end_date") else None
+        start = _iso_to_date(raw["start_date"]) if raw.get("start_date") else None
+        end = _iso_to_date(raw["end_date"]) if raw.get("end_date") else None
         return cls(
             version=raw.get("version", "unknown"),
             start_date=start,
@@ -95,9 +133,18 @@ class FeedMeta:
             file_path=raw.get("file_path", ""),
             source=raw.get("source", "local"),
             downloaded_at=raw.get("downloaded_at", ""),
+            sha256=raw.get("sha256", ""),
         )
 
 
+@dataclass(slots=True)
+class _Flight:
+    """One in-progress feed download and the number of callers awaiting it."""
+
+    task: asyncio.Task[FeedMeta]
+    waiters: int = 0
+
+
 class GtfsStore:
     """Manage static GTFS download, caching and active feed selection."""
 
@@ -107,7 +154,15 @@ class GtfsStore:
         self.base_dir = Path(hass.config.path(".storage", DOMAIN))
         self.feeds_dir = self.base_dir / "feeds"
         self.state_path = self.base_dir / "state.json"
+        # feed URL -> {"version", "etag", "last_modified"} of its last full download.
+        self.validators_path = self.base_dir / "http_validators.json"
+        self._validators: dict[str, dict[str, str]] | None = None
+        # meta file -> (st_mtime_ns, parsed FeedMeta); FeedMeta values are shared, never mutated.
+        self._meta_cache: dict[Path, tuple[int, FeedMeta]] = {}
+        self._install_lock = asyncio.Lock()
+        self._inflight: dict[str, _Flight] = {}
         self._dirs_ready = False
+        self._dirs_lock = asyncio.Lock()
         self.debug: dict = {
             "today": None,
             "latest_version": None,
@@ -122,69 +177,95 @@ class GtfsStore:
 
     async def refresh_latest(self) -> FeedMeta:
         """Download latest GTFS feed and cache locally."""
-        await self._ensure_dirs()
-        _LOGGER.debug("Downloading static GTFS feed from %s", STATIC_GTFS_URL)
-        async with self.session.get(STATIC_GTFS_URL, timeout=60) as response:
-            response.raise_for_status()
-            payload = await response.read()
-
-        digest = hashlib.sha256(payload).hexdigest()[:12]
-        feed_info = await self.hass.async_add_executor_job(self._extract_feed_info, payload)
-        version_raw = feed_info.get("feed_version") or f"hash_{digest}"
-        version = _safe_version(version_raw)
-
-        zip_path = self.feeds_dir / f"{version}.zip"
-        meta_path = self.feeds_dir / f"{version}.json"
-        cached = await self._load_cached_meta_if_present(zip_path, meta_path)
-        if cached:
-            return cached
-        await self.hass.async_add_executor_job(zip_path.write_bytes, payload)
-
-        meta = FeedMeta(
-            version=version,
-            start_date=_parse_date(feed_info.get("feed_start_date")),
-            end_date=_parse_date(feed_info.get("feed_end_date")),
-            file_path=str(zip_path),
-            source="latest",
-            downloaded_at=datetime.utcnow().isoformat(),
-        )
-
-        meta_json = json.dumps(meta.to_dict(), indent=2)
-        await self.hass.async_add_executor_job(meta_path.write_text, meta_json, "utf-8")
-        await self.prune_old_feeds(keep_versions=MAX_CACHED_FEEDS)
-        return meta
+        return await self.refresh_from_url(STATIC_GTFS_URL, source="latest")
 
     async def refresh_from_url(self, feed_url: str, source: str) -> FeedMeta:
         """Download GTFS feed from arbitrary URL and cache it."""
+        # Callers asking for a URL that is already downloading share that download.
+        flight = self._inflight.get(feed_url)
+        if flight is None:
+            flight = _Flight(asyncio.create_task(self._refresh_from_url(feed_url, source)))
+            self._inflight[feed_url] = flight
+            flight.task.add_done_callback(lambda _task: self._inflight.pop(feed_url, None))
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            # Stop the download once every caller has given up on it.
+            if not flight.waiters and not flight.task.done():
+                flight.task.cancel()
+
+    async def _refresh_from_url(self, feed_url: str, source: str) -> FeedMeta:
         await self._ensure_dirs()
+        # Revalidate with the validators of the last download when that feed is still cached.
+        previous = (await self._load_validators()).get(feed_url) or {}
+        cached_previous: FeedMeta | None = None
+        if previous.get("version"):
+            previous_version = previous["version"]
+            cached_previous = await self._load_cached_meta_if_present(
+                self.feeds_dir / f"{previous_version}.zip", self.feeds_dir / f"{previous_version}.json"
+            )
+        headers: dict[str, str] = {}
+        if cached_previous:
+            if previous.get("etag"):
+                headers["If-None-Match"] = previous["etag"]
+            if previous.get("last_modified"):
+                headers["If-Modified-Since"] = previous["last_modified"]
+
         _LOGGER.debug("Downloading GTFS feed from %s", feed_url)
-        async with self.session.get(feed_url, timeout=60) as response:
+        async with self.session.get(feed_url, timeout=60, headers=headers) as response:
+            if response.status == 304 and cached_previous:
+                _LOGGER.debug("GTFS feed %s not modified, reusing version %s", feed_url, cached_previous.version)
+                return cached_previous
             response.raise_for_status()
-            payload = await response.read()
-
-        digest = hashlib.sha256(payload).hexdigest()[:12]
-        feed_info = await self.hass.async_add_executor_job(self._extract_feed_info, payload)
-        version_raw = feed_info.get("feed_version") or f"hash_{digest}"
-        version = _safe_version(version_raw)
-
-        zip_path = self.feeds_dir / f"{version}.zip"
-        meta_path = self.feeds_dir / f"{version}.json"
-        cached = await self._load_cached_meta_if_present(zip_path, meta_path)
-        if cached:
-            return cached
-        await self.hass.async_add_executor_job(zip_path.write_bytes, payload)
-
-        meta = FeedMeta(
-            version=version,
-            start_date=_parse_date(feed_info.get("feed_start_date")),
-            end_date=_parse_date(feed_info.get("feed_end_date")),
-            file_path=str(zip_path),
-            source=source,
-            downloaded_at=datetime.utcnow().isoformat(),
-        )
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            # The version is only known once feed_info.txt can be read, so land the body
+            # in a uniquely named part file first.
+            part_path = self.feeds_dir / f"download-{uuid.uuid4().hex}.part"
+            try:
+                digest = await self._download_to_file(response, part_path)
+            except BaseException:
+                await self.hass.async_add_executor_job(_unlink_quietly, part_path)
+                raise
+
+        try:
+            # A byte-identical zip is already cached (e.g. /latest and /<version> of one feed).
+            duplicate = next((meta for meta in await self.list_cached_feeds() if meta.sha256 == digest), None)
+            if duplicate and await self.hass.async_add_executor_job(Path(duplicate.file_path).exists):
+                await self.hass.async_add_executor_job(_unlink_quietly, part_path)
+                await self._remember_validators(feed_url, duplicate.version, etag, last_modified)
+                return duplicate
+
+            feed_info, version = await self.hass.async_add_executor_job(self._identify_feed, part_path, digest)
+            # Concurrent probes can land the same version; install downloads one at a time.
+            async with self._install_lock:
+                await self._remember_validators(feed_url, version, etag, last_modified)
+
+                zip_path = self.feeds_dir / f"{version}.zip"
+                meta_path = self.feeds_dir / f"{version}.json"
+                cached = await self._load_cached_meta_if_present(zip_path, meta_path)
+                if cached:
+                    await self.hass.async_add_executor_job(_unlink_quietly, part_path)
+                    return cached
+                await self.hass.async_add_executor_job(os.replace, part_path, zip_path)
+
+                meta = FeedMeta(
+                    version=version,
+                    start_date=_parse_date(feed_info.get("feed_start_date")),
+                    end_date=_parse_date(feed_info.get("feed_end_date")),
+                    file_path=str(zip_path),
+                    source=source,
+                    downloaded_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    sha256=digest,
+                )
+
+                await self.hass.async_add_executor_job(meta_path.write_bytes, json_bytes(meta.to_dict()))
+        except BaseException:
+            await self.hass.async_add_executor_job(_unlink_quietly, part_path)
+            raise
 
-        meta_json = json.dumps(meta.to_dict(), indent=2)
-        await self.hass.async_add_executor_job(meta_path.write_text, meta_json, "utf-8")
         await self.prune_old_feeds(keep_versions=MAX_CACHED_FEEDS)
         return meta
 
@@ -214,28 +295,30 @@ class GtfsStore:
             _LOGGER.warning("GTFS listing fallback found less than 2 candidates: %s", all_candidates)
             return None
 
-        valid_metas: list[FeedMeta] = []
-        attempts = 0
-
         # Skip first candidate (equivalent to latest), then inspect archived ones.
-        for fallback_url in all_candidates[1:]:
-            if attempts >= MAX_LISTING_CANDIDATES_TO_TRY:
-                break
-            attempts += 1
-            self.debug["tried_listing_urls"].append(fallback_url)
+        fallback_urls = all_candidates[1:1 + MAX_LISTING_CANDIDATES_TO_TRY]
+        attempts = len(fallback_urls)
+        self.debug["tried_listing_urls"].extend(fallback_urls)
+        for fallback_url in fallback_urls:
             _LOGGER.info("Trying listing fallback feed: %s", fallback_url)
-            try:
-                meta = await self.refresh_from_url(fallback_url, source="listing_previous")
-                if meta.is_valid_for(today):
-                    valid_metas.append(meta)
-                    continue
-                _LOGGER.warning(
-                    "Listing fallback candidate not valid for today. version=%s range=%s",
-                    meta.version,
-                    meta.valid_range,
-                )
-            except Exception as err:  # noqa: BLE001
-                _LOGGER.warning("Failed downloading listing fallback feed %s: %s", fallback_url, err)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FEED_PROBES)
+        results = await asyncio.gather(
+            *(self._probe_feed(semaphore, fallback_url, "listing_previous") for fallback_url in fallback_urls)
+        )
+
+        valid_metas: list[FeedMeta] = []
+        for fallback_url, result in zip(fallback_urls, results):
+            if isinstance(result, Exception):
+                _LOGGER.warning("Failed downloading listing fallback feed %s: %s", fallback_url, result)
+                continue
+            if result.is_valid_for(today):
+                valid_metas.append(result)
+                continue
+            _LOGGER.warning(
+                "Listing fallback candidate not valid for today. version=%s range=%s",
+                result.version,
+                result.valid_range,
+            )
 
         if not valid_metas:
             self.debug["listing_attempts"] = attempts
@@ -255,55 +338,79 @@ class GtfsStore:
         current = int(latest_version)
         base = STATIC_GTFS_URL.rsplit("/", 1)[0]
 
-        attempts = 0
+        candidate_urls: list[str] = []
         for offset in range(1, MAX_PREVIOUS_VERSION_TRIES + 1):
             candidate = str(current - offset).zfill(width)
             if int(candidate) <= 0:
                 break
-            attempts += 1
-            candidate_url = f"{base}/{candidate}"
-            self.debug["tried_version_urls"].append(candidate_url)
-            try:
-                meta = await self.refresh_from_url(candidate_url, source="version_previous")
-            except Exception as err:  # noqa: BLE001
-                _LOGGER.debug("Previous version candidate failed %s: %s", candidate_url, err)
-                continue
+            candidate_urls.append(f"{base}/{candidate}")
+
+        # Download candidates concurrently but accept them newest first, as a sequential scan would.
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FEED_PROBES)
+        tasks = [
+            asyncio.create_task(self._probe_feed(semaphore, candidate_url, "version_previous"))
+            for candidate_url in candidate_urls
+        ]
+        attempts = 0
+        try:
+            for candidate_url, task in zip(candidate_urls, tasks):
+                attempts += 1
+                self.debug["tried_version_urls"].append(candidate_url)
+                meta = await task
+                if isinstance(meta, Exception):
+                    _LOGGER.debug("Previous version candidate failed %s: %s", candidate_url, meta)
+                    continue
+
+                if meta.is_valid_for(today):
+                    _LOGGER.info(
+                        "Using previous version candidate %s valid for %s",
+                        meta.version,
+                        today.isoformat(),
+                    )
+                    self.debug["selected_strategy"] = "version_previous"
+                    self.debug["version_attempts"] = attempts
+                    return meta
 
-            if meta.is_valid_for(today):
-                _LOGGER.info(
-                    "Using previous version candidate %s valid for %s",
+                _LOGGER.warning(
+                    "Previous version candidate not valid for today. version=%s range=%s",
                     meta.version,
-                    today.isoformat(),
+                    meta.valid_range,
                 )
-                self.debug["selected_strategy"] = "version_previous"
-                self.debug["version_attempts"] = attempts
-                return meta
-
-            _LOGGER.warning(
-                "Previous version candidate not valid for today. version=%s range=%s",
-                meta.version,
-                meta.valid_range,
-            )
+        finally:
+            # Older candidates are not needed once one is accepted.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
         self.debug["version_attempts"] = attempts
         return None
 
+    async def _probe_feed(self, semaphore: asyncio.Semaphore, feed_url: str, source: str) -> FeedMeta | Exception:
+        async with semaphore:
+            try:
+                return await self.refresh_from_url(feed_url, source=source)
+            except Exception as err:  # noqa: BLE001
+                return err
+
     async def list_cached_feeds(self) -> list[FeedMeta]:
         """Return cached feeds sorted newest first."""
         await self._ensure_dirs()
+        feeds = await self.hass.async_add_executor_job(self._scan_feeds_blocking)
+        feeds.sort(key=_meta_rank, reverse=True)
+        return feeds
+
+    def _scan_feeds_blocking(self) -> list[FeedMeta]:
+        with os.scandir(self.feeds_dir) as entries:
+            meta_entries = [entry for entry in entries if entry.name.endswith(".json")]
+        # Name order keeps equally ranked feeds in a stable order after the rank sort.
+        meta_entries.sort(key=lambda entry: entry.name)
         feeds: list[FeedMeta] = []
-        meta_files = await self.hass.async_add_executor_job(
-            lambda: sorted(self.feeds_dir.glob("*.json"))
-        )
-        for meta_file in meta_files:
+        for entry in meta_entries:
             try:
-                text = await self.hass.async_add_executor_job(meta_file.read_text, "utf-8")
-                raw = json.loads(text)
-                feeds.append(FeedMeta.from_dict(raw))
+                if entry.is_file():
+                    feeds.append(self._read_meta_cached(Path(entry.path), entry.stat().st_mtime_ns))
             except Exception as err:  # noqa: BLE001
-                _LOGGER.warning("Failed loading feed meta %s: %s", meta_file, err)
-
-        feeds.sort(key=_meta_rank, reverse=True)
+                _LOGGER.warning("Failed loading feed meta %s: %s", entry.path, err)
         return feeds
 
     async def get_active_feed(self, today: date, latest_meta: FeedMeta | None) -> tuple[FeedMeta | None, str, str]:
@@ -368,11 +475,9 @@ class GtfsStore:
         self.debug["selected_strategy"] = "none"
         return None, "none", "degraded"
 
-    async def load_feed_bytes(self, meta: FeedMeta) -> bytes:
-        """Load cached zip bytes for selected feed."""
-        await self._ensure_dirs()
-        path = Path(meta.file_path)
-        return await self.hass.async_add_executor_job(path.read_bytes)
+    def index_cache_path(self, meta: FeedMeta) -> Path:
+        """Path of the pickled GtfsIndex kept next to a cached feed zip."""
+        return Path(meta.file_path).with_suffix(".index.pickle")
 
     async def force_select(self, version: str) -> FeedMeta | None:
         """Force active feed version if locally available."""
@@ -385,81 +490,173 @@ class GtfsStore:
     async def prune_old_feeds(self, keep_versions: int = MAX_CACHED_FEEDS) -> None:
         """Delete old cached GTFS feed files and metadata."""
         cached = await self.list_cached_feeds()
-        for meta in cached[max(1, keep_versions):]:
+        stale = cached[max(1, keep_versions):]
+        if stale:
+            await self.hass.async_add_executor_job(self._prune_blocking, stale)
+
+    def _prune_blocking(self, stale: list[FeedMeta]) -> None:
+        for meta in stale:
             zip_path = Path(meta.file_path)
-            meta_path = zip_path.with_suffix(".json")
             try:
-                if await self.hass.async_add_executor_job(zip_path.exists):
-                    await self.hass.async_add_executor_job(zip_path.unlink)
-                if await self.hass.async_add_executor_job(meta_path.exists):
-                    await self.hass.async_add_executor_job(meta_path.unlink)
+                zip_path.unlink(missing_ok=True)
+                meta_path = zip_path.with_suffix(".json")
+                meta_path.unlink(missing_ok=True)
+                self._meta_cache.pop(meta_path, None)
+                self.index_cache_path(meta).unlink(missing_ok=True)
             except Exception as err:  # noqa: BLE001
                 _LOGGER.warning("Failed pruning cached feed %s: %s", zip_path, err)
 
-    def _extract_feed_info(self, payload: bytes) -> dict[str, str]:
+    async def _download_to_file(self, response: ClientResponse, part_path: Path) -> str:
+        """Stream a response body to disk in bounded batches and return its SHA-256."""
+        hasher = hashlib.sha256()
+        handle = await self.hass.async_add_executor_job(part_path.open, "wb")
+        size = 0
+        batch = bytearray()
+        try:
+            async for chunk in response.content.iter_chunked(_DOWNLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                batch += chunk
+                if len(batch) >= _WRITE_BATCH_SIZE:
+                    # Awaiting each write bounds memory to one batch and surfaces disk errors immediately.
+                    await self.hass.async_add_executor_job(_write_batch, handle, hasher, batch)
+                    batch.clear()
+            if batch:
+                await self.hass.async_add_executor_job(_write_batch, handle, hasher, batch)
+        finally:
+            await self.hass.async_add_executor_job(handle.close)
+
+        # Content-Length describes the encoded body, so only compare plain transfers.
+        expected = response.content_length
+        if expected is not None and not response.headers.get("Content-Encoding") and size != expected:
+            raise ValueError(f"Incomplete GTFS download: received {size} of {expected} bytes")
+        return hasher.hexdigest()
+
+    def _identify_feed(self, zip_path: Path, digest: str) -> tuple[dict[str, str], str]:
+        """Return the feed_info row and cache version of a downloaded zip."""
+        feed_info = self._extract_feed_info(zip_path)
+        version_raw = feed_info.get("feed_version") or f"hash_{digest[:12]}"
+        return feed_info, _safe_version(version_raw)
+
+    def _extract_feed_info(self, zip_path: Path) -> dict[str, str]:
         """Extract one row from feed_info.txt."""
-        with zipfile.ZipFile(io.BytesIO(payload)) as archive:
-            members = archive.namelist()
+        with zipfile.ZipFile(zip_path) as archive:
             feed_info_member = next(
-                (name for name in members if name.lower().endswith("/feed_info.txt") or name.lower() == "feed_info.txt"),
+                (info for info in archive.infolist() if info.filename.rsplit("/", 1)[-1].lower() == "feed_info.txt"),
                 None,
             )
             if not feed_info_member:
                 return {}
+            # Only the header and first row are needed; stream them instead of reading the member.
             with archive.open(feed_info_member) as handle:
-                text = handle.read().decode("utf-8-sig", errors="replace")
-
-        rows = list(csv.DictReader(io.StringIO(text)))
-        return rows[0] if rows else {}
+                text = io.TextIOWrapper(handle, encoding="utf-8-sig", errors="replace", newline="")
+                return next(csv.DictReader(text), {})
 
     async def _load_state(self) -> dict:
         await self._ensure_dirs()
-        exists = await self.hass.async_add_executor_job(self.state_path.exists)
-        if not exists:
-            return {}
         try:
-            text = await self.hass.async_add_executor_job(self.state_path.read_text, "utf-8")
-            return json.loads(text)
+            raw = await self.hass.async_add_executor_job(self.state_path.read_bytes)
+            return json_loads(raw)
         except Exception:  # noqa: BLE001
             return {}
 
     async def _save_state(self, data: dict) -> None:
         await self._ensure_dirs()
-        state_json = json.dumps(data, indent=2)
-        await self.hass.async_add_executor_job(self.state_path.write_text, state_json, "utf-8")
+        await self.hass.async_add_executor_job(self.state_path.write_bytes, json_bytes(data))
+
+    async def _load_validators(self) -> dict[str, dict[str, str]]:
+        if self._validators is None:
+            try:
+                raw = await self.hass.async_add_executor_job(self.validators_path.read_bytes)
+                self._validators = json_loads(raw)
+            except FileNotFoundError:
+                self._validators = {}
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.debug("Ignoring unreadable HTTP validators %s: %s", self.validators_path, err)
+                self._validators = {}
+        return self._validators
+
+    async def _remember_validators(
+        self, feed_url: str, version: str, etag: str | None, last_modified: str | None
+    ) -> None:
+        """Persist ETag/Last-Modified of a feed download for conditional refreshes."""
+        validators = await self._load_validators()
+        entry = None
+        if etag or last_modified:
+            entry = {"version": version, "etag": etag or "", "last_modified": last_modified or ""}
+        if validators.get(feed_url) == entry:
+            return
+        if entry is None:
+            validators.pop(feed_url, None)
+        else:
+            validators[feed_url] = entry
+        await self.hass.async_add_executor_job(self.validators_path.write_bytes, json_bytes(validators))
 
     async def _load_cached_meta_if_present(self, zip_path: Path, meta_path: Path) -> FeedMeta | None:
-        if not await self.hass.async_add_executor_job(zip_path.exists):
-            return None
-        if not await self.hass.async_add_executor_job(meta_path.exists):
+        return await self.hass.async_add_executor_job(self._load_meta_blocking, zip_path, meta_path)
+
+    def _load_meta_blocking(self, zip_path: Path, meta_path: Path) -> FeedMeta | None:
+        if not zip_path.exists() or not meta_path.exists():
             return None
         try:
-            text = await self.hass.async_add_executor_job(meta_path.read_text, "utf-8")
-            raw = json.loads(text)
-            meta = FeedMeta.from_dict(raw)
+            meta = self._read_meta_cached(meta_path)
             if not meta.file_path:
-                meta.file_path = str(zip_path)
+                meta = replace(meta, file_path=str(zip_path))
             return meta
         except Exception as err:  # noqa: BLE001
             _LOGGER.warning("Failed loading cached feed meta %s: %s", meta_path, err)
             return None
 
+    def _read_meta_cached(self, meta_path: Path, mtime_ns: int | None = None) -> FeedMeta:
+        """Parse a feed meta file, reusing the last parse while its mtime is unchanged."""
+        if mtime_ns is None:
+            mtime_ns = meta_path.stat().st_mtime_ns
+        cached = self._meta_cache.get(meta_path)
+        if cached and cached[0] == mtime_ns:
+            return cached[1]
+        meta = FeedMeta.from_dict(json_loads(meta_path.read_bytes()))
+        self._meta_cache[meta_path] = (mtime_ns, meta)
+        return meta
+
     async def _ensure_dirs(self) -> None:
         if self._dirs_ready:
             return
-        await self.hass.async_add_executor_job(self._mkdir_dirs)
-        self._dirs_ready = True
+        # Concurrent first callers wait for one mkdir instead of each scheduling their own.
+        async with self._dirs_lock:
+            if not self._dirs_ready:
+                await self.hass.async_add_executor_job(self._mkdir_dirs)
+                self._dirs_ready = True
 
     def _mkdir_dirs(self) -> None:
         self.base_dir.mkdir(parents=True, exist_ok=True)
         self.feeds_dir.mkdir(parents=True, exist_ok=True)
+        # Downloads interrupted by a restart leave their part files behind; anything
+        # recent may belong to a download that is still running.
+        cutoff = time.time() - _STALE_PART_SECONDS
+        for part_path in self.feeds_dir.glob("*.part"):
+            try:
+                if part_path.stat().st_mtime < cutoff:
+                    _unlink_quietly(part_path)
+            except OSError:
+                continue
 
     def _extract_listing_candidates(self, html: str, base_url: str) -> list[str]:
         """Extract GTFS feed hrefs from listing page, preserving order and deduplicating."""
-        hrefs = re.findall(r'href=["\']([^"\']+)["\']', html, flags=re.IGNORECASE)
+        # Candidates need "gtfs" or ".zip" in the href itself, unless the page already lives
+        # under /gtfs-scheduled/ where a bare relative href can resolve to a feed.
+        prefilter = "/gtfs-scheduled/" not in urlparse(base_url).path.lower()
         full_urls: list[str] = []
         seen: set[str] = set()
-        for href in hrefs:
+        # Navigation menus repeat the same hrefs; resolve each distinct one once.
+        seen_hrefs: set[str] = set()
+        for match in _HREF_RE.finditer(html):
+            href = match.group(1)
+            if href in seen_hrefs:
+                continue
+            seen_hrefs.add(href)
+            if prefilter:
+                href_l = href.lower()
+                if "gtfs" not in href_l and ".zip" not in href_l:
+                    continue
             url = urljoin(base_url, href)
             if not self._is_gtfs_candidate(url):
                 continue
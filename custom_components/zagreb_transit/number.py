@@ -28,7 +28,31 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     )
 
 
-class ZagrebTransitWindowMinutesNumber(CoordinatorEntity, NumberEntity):
+class _SelectionNumber(CoordinatorEntity, NumberEntity):
+    """Number mirroring one selection value; the value is re-read only when coordinator.data changes."""
+
+    _selection_key: str
+    _default_value: float
+
+    def __init__(self, coordinator) -> None:
+        super().__init__(coordinator)
+        self._value_data: dict | None = None
+        self._value = self._default_value
+
+    @property
+    def native_value(self):
+        data = self.coordinator.data
+        if data is not self._value_data:
+            value = (data or {}).get("selection", {}).get(self._selection_key)
+            self._value = self._default_value if value is None else float(value)
+            self._value_data = data
+        return self._value
+
+    async def async_set_native_value(self, value: float) -> None:
+        await self.coordinator.async_set_selection(self._selection_key, int(value))
+
+
+class ZagrebTransitWindowMinutesNumber(_SelectionNumber):
     _attr_has_entity_name = True
     _attr_unique_id = "zet_window_minutes"
     _attr_name = "zet_window_minutes"
@@ -37,20 +61,11 @@ class ZagrebTransitWindowMinutesNumber(CoordinatorEntity, NumberEntity):
     _attr_native_max_value = MAX_WINDOW_MINUTES
     _attr_native_step = 1
     _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    _selection_key = "window_minutes"
+    _default_value = MIN_WINDOW_MINUTES
 
-    @property
-    def native_value(self):
-        data = self.coordinator.data or {}
-        value = data.get("selection", {}).get("window_minutes")
-        if value is None:
-            return MIN_WINDOW_MINUTES
-        return float(value)
-
-    async def async_set_native_value(self, value: float) -> None:
-        await self.coordinator.async_set_selection("window_minutes", int(value))
 
-
-class ZagrebTransitNearbyRadiusNumber(CoordinatorEntity, NumberEntity):
+class ZagrebTransitNearbyRadiusNumber(_SelectionNumber):
     _attr_has_entity_name = True
     _attr_unique_id = "zet_nearby_radius_meters"
     _attr_name = "zet_nearby_radius_meters"
@@ -59,14 +74,5 @@ class ZagrebTransitNearbyRadiusNumber(CoordinatorEntity, NumberEntity):
     _attr_native_max_value = MAX_NEARBY_RADIUS_METERS
     _attr_native_step = 5
     _attr_native_unit_of_measurement = "m"
-
-    @property
-    def native_value(self):
-        data = self.coordinator.data or {}
-        value = data.get("selection", {}).get("nearby_radius_meters")
-        if value is None:
-            return float(DEFAULT_NEARBY_RADIUS_METERS)
-        return float(value)
-
-    async def async_set_native_value(self, value: float) -> None:
-        await self.coordinator.async_set_selection("nearby_radius_meters", int(value))
+    _selection_key = "nearby_radius_meters"
+    _default_value = float(DEFAULT_NEARBY_RADIUS_METERS)
@@ -6,11 +6,16 @@ from datetime import datetime, timezone
 import logging
 
 from aiohttp import ClientSession
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
 
 from .const import REALTIME_DELAY_MAX_STALE_SECONDS, REALTIME_GTFS_URL
 
 _LOGGER = logging.getLogger(__name__)
 
+# Delays change every poll; persist at most this often.
+REALTIME_SAVE_DELAY = 60
+
 try:
     from google.transit import gtfs_realtime_pb2  # type: ignore
 except Exception:  # noqa: BLE001
@@ -20,8 +25,11 @@ except Exception:  # noqa: BLE001
 class RealtimeClient:
     """Fetch and parse GTFS-RT trip updates."""
 
-    def __init__(self, session: ClientSession) -> None:
+    def __init__(self, hass: HomeAssistant, session: ClientSession, store: Store) -> None:
+        self.hass = hass
         self.session = session
+        # Last good trip delays, so a restart does not start from an empty realtime state.
+        self._store = store
         self._last_success_utc: datetime | None = None
         self.last_result: dict = {
             "status": "stale",
@@ -30,6 +38,39 @@ class RealtimeClient:
             "error": None,
         }
 
+    async def async_load(self) -> None:
+        """Restore the last good trip delays if they are recent enough to keep using."""
+        stored = await self._store.async_load()
+        if not isinstance(stored, dict):
+            return
+        try:
+            saved_at = datetime.fromisoformat(stored["saved_at"])
+            trip_delays = {str(trip_id): int(delay) for trip_id, delay in stored["trip_delays"].items()}
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Ignoring unreadable stored realtime delays: %s", err)
+            return
+        if (datetime.now(timezone.utc) - saved_at).total_seconds() > REALTIME_DELAY_MAX_STALE_SECONDS:
+            return
+        self._last_success_utc = saved_at
+        self.last_result = {
+            "status": "stale",
+            "last_timestamp": stored.get("last_timestamp"),
+            "trip_delays": trip_delays,
+            "error": None,
+        }
+
+    async def async_save(self) -> None:
+        """Write the last good trip delays now, superseding any pending delayed save."""
+        if self._last_success_utc is not None:
+            await self._store.async_save(self._stored_payload())
+
+    def _stored_payload(self) -> dict:
+        return {
+            "saved_at": self._last_success_utc.isoformat() if self._last_success_utc else None,
+            "last_timestamp": self.last_result.get("last_timestamp"),
+            "trip_delays": self.last_result.get("trip_delays", {}),
+        }
+
     async def refresh(self) -> dict:
         """Refresh realtime data and return normalized structure."""
         if gtfs_realtime_pb2 is None:
@@ -46,35 +87,7 @@ class RealtimeClient:
                 response.raise_for_status()
                 payload = await response.read()
 
-            message = gtfs_realtime_pb2.FeedMessage()
-            message.ParseFromString(payload)
-
-            trip_delays: dict[str, int] = {}
-            last_ts = None
-
-            for entity in message.entity:
-                if not entity.HasField("trip_update"):
-                    continue
-                trip = entity.trip_update.trip
-                trip_id = trip.trip_id
-                if not trip_id:
-                    continue
-
-                delay = 0
-                updates = entity.trip_update.stop_time_update
-                for update in updates:
-                    if update.HasField("departure") and update.departure.HasField("delay"):
-                        delay = int(update.departure.delay)
-                        break
-                    if update.HasField("arrival") and update.arrival.HasField("delay"):
-                        delay = int(update.arrival.delay)
-                        break
-
-                if entity.trip_update.HasField("timestamp"):
-                    ts = int(entity.trip_update.timestamp)
-                    last_ts = max(last_ts or ts, ts)
-
-                trip_delays[trip_id] = delay
+            trip_delays, last_ts = await self.hass.async_add_executor_job(self._parse_payload, payload)
 
             last_iso = (
                 datetime.fromtimestamp(last_ts, tz=timezone.utc).isoformat()
@@ -88,6 +101,7 @@ class RealtimeClient:
                 "error": None,
             }
             self._last_success_utc = datetime.now(timezone.utc)
+            self._store.async_delay_save(self._stored_payload, REALTIME_SAVE_DELAY)
             return self.last_result
 
         except Exception as err:  # noqa: BLE001
@@ -106,3 +120,35 @@ class RealtimeClient:
                 "error": str(err),
             }
             return self.last_result
+
+    def _parse_payload(self, payload: bytes) -> tuple[dict[str, int], int | None]:
+        """Parse a GTFS-RT payload into per-trip delays and the newest update timestamp."""
+        # A fresh message per call: manual and periodic refreshes can parse concurrently.
+        message = gtfs_realtime_pb2.FeedMessage()
+        message.ParseFromString(payload)
+        return self._extract_delays(message)
+
+    @staticmethod
+    def _extract_delays(message) -> tuple[dict[str, int], int | None]:
+        trip_updates = [
+            trip_update
+            for trip_update in (entity.trip_update for entity in message.entity)
+            if trip_update.trip.trip_id
+        ]
+        trip_delays = {trip_update.trip.trip_id: _first_delay(trip_update) for trip_update in trip_updates}
+        # Unset timestamps read as 0 and never win.
+        last_ts = max((trip_update.timestamp for trip_update in trip_updates), default=0)
+        return trip_delays, last_ts or None
+
+
+def _first_delay(trip_update) -> int:
+    # Unset sub-messages read as empty defaults, so only the proto2 "delay" presence
+    # checks need HasField: an explicit delay of 0 still wins over a later one.
+    for update in trip_update.stop_time_update:
+        departure = update.departure
+        if departure.HasField("delay"):
+            return int(departure.delay)
+        arrival = update.arrival
+        if arrival.HasField("delay"):
+            return int(arrival.delay)
+    return 0
@@ -42,11 +42,17 @@ class ZagrebTransitSelectEntity(CoordinatorEntity, SelectEntity):
         self._attr_unique_id = unique_id
         self._attr_name = unique_id
         self._attr_icon = icon
+        # Options for the coordinator.data they were read from; each build returns a new dict.
+        self._options_data: dict | None = None
+        self._options: list[str] = []
 
     @property
     def options(self) -> list[str]:
-        data = self.coordinator.data or {}
-        return list(data.get("options", {}).get(self._option_key, []))
+        data = self.coordinator.data
+        if data is not self._options_data:
+            self._options = list((data or {}).get("options", {}).get(self._option_key, []))
+            self._options_data = data
+        return self._options
 
     @property
     def current_option(self) -> str | None:
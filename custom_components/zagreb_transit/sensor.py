@@ -2,52 +2,65 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+import logging
+from types import MappingProxyType
+
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, ICON_STATUS, ICON_TRANSIT
 
-_NEARBY_ATTR_MAX_STOPS = 4
-_NEARBY_ATTR_MAX_DEPARTURES_PER_STOP = 4
+_LOGGER = logging.getLogger(__name__)
+
+_WATCH_SENSORS_COOLDOWN = 0.25
+_OPTIONAL_WATCH_KEYS = (
+    "grouped",
+    "stations",
+    "stops",
+    "window_minutes",
+    "radius_meters",
+    "location_source",
+)
+_EMPTY_WATCH: Mapping = MappingProxyType({})
+
+# (unique_id, state key, icon)
+_BASIC_SENSORS = (
+    ("zagreb_transport_feed_version_active", "feed_version", "mdi:source-branch"),
+    ("zagreb_transport_feed_valid_from", "feed_valid_from", "mdi:calendar-start"),
+    ("zagreb_transport_feed_valid_to", "feed_valid_to", "mdi:calendar-end"),
+    ("zagreb_transport_feed_source", "feed_source", "mdi:database-arrow-down"),
+    ("zagreb_transport_realtime_status", "realtime_status", ICON_STATUS),
+    ("zagreb_transport_realtime_last_timestamp", "realtime_last_timestamp", "mdi:clock-check"),
+)
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities) -> None:
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    known_watch_ids: set[str] = set()
+    known_watch_ids: dict[str, None] = {}
 
     @callback
-    def _add_watch_sensors(_new_watch_id: str | None = None) -> None:
-        new_entities: list[SensorEntity] = []
+    def _add_watch_sensors() -> None:
         ordered_watch_ids = coordinator.watch_ids()
-        current_watch_ids = set(ordered_watch_ids)
-        # Keep local cache aligned so re-used watch ids can be re-added.
-        known_watch_ids.intersection_update(current_watch_ids)
-
-        for watch_id in ordered_watch_ids:
-            if watch_id in known_watch_ids:
-                continue
-            known_watch_ids.add(watch_id)
-            new_entities.append(
-                ZagrebTransitWatchSensor(
-                    coordinator,
-                    watch_id,
-                    coordinator.watch_entity_key(watch_id),
-                )
-            )
+        new_entities = [
+            ZagrebTransitWatchSensor(coordinator, watch_id, coordinator.watch_entity_key(watch_id))
+            for watch_id in ordered_watch_ids
+            if watch_id not in known_watch_ids
+        ]
+        # Mirror the current order so removed ids drop out and re-used ids can be re-added.
+        known_watch_ids.clear()
+        known_watch_ids.update(dict.fromkeys(ordered_watch_ids))
         if new_entities:
             async_add_entities(new_entities)
 
     async_add_entities(
         [
-            ZagrebTransitBasicSensor(coordinator, "zagreb_transport_feed_version_active", "feed_version", "mdi:source-branch"),
-            ZagrebTransitBasicSensor(coordinator, "zagreb_transport_feed_valid_from", "feed_valid_from", "mdi:calendar-start"),
-            ZagrebTransitBasicSensor(coordinator, "zagreb_transport_feed_valid_to", "feed_valid_to", "mdi:calendar-end"),
-            ZagrebTransitBasicSensor(coordinator, "zagreb_transport_feed_source", "feed_source", "mdi:database-arrow-down"),
-            ZagrebTransitBasicSensor(coordinator, "zagreb_transport_realtime_status", "realtime_status", ICON_STATUS),
-            ZagrebTransitBasicSensor(coordinator, "zagreb_transport_realtime_last_timestamp", "realtime_last_timestamp", "mdi:clock-check"),
+            *(ZagrebTransitBasicSensor(coordinator, *spec) for spec in _BASIC_SENSORS),
             ZagrebTransitDebugSensor(coordinator),
             ZagrebTransitWatchRegistrySensor(coordinator),
             ZagrebTransitOdDoSensor(coordinator),
@@ -56,20 +69,58 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         ]
     )
 
-    _add_watch_sensors(None)
+    _add_watch_sensors()
+
+    # Bursts of watch edits collapse into one batched add after the cooldown.
+    debouncer = Debouncer(
+        hass,
+        _LOGGER,
+        cooldown=_WATCH_SENSORS_COOLDOWN,
+        immediate=True,
+        function=_add_watch_sensors,
+    )
+
+    entry.async_on_unload(debouncer.async_cancel)
     entry.async_on_unload(
-        async_dispatcher_connect(hass, coordinator.watches_changed_signal, _add_watch_sensors)
+        async_dispatcher_connect(hass, coordinator.watches_changed_signal, debouncer.async_schedule_call)
     )
 
 
 class ZagrebTransitBaseSensor(CoordinatorEntity, SensorEntity):
     _attr_has_entity_name = True
 
-    def __init__(self, coordinator, unique_id: str, name: str, icon: str) -> None:
-        super().__init__(coordinator)
+    def __init__(self, coordinator, unique_id: str, name: str, icon: str, context: str | None = None) -> None:
+        super().__init__(coordinator, context)
         self._attr_unique_id = unique_id
         self._attr_name = name
         self._attr_icon = icon
+        self._attrs_data: dict | None = None
+        self._attrs: dict | None = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._attr_native_value = self._native_value(self.coordinator.data)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # State is read far more often than it changes; resolve it once per update.
+        self._attr_native_value = self._native_value(self.coordinator.data)
+        super()._handle_coordinator_update()
+
+    @property
+    def extra_state_attributes(self):
+        # Attributes are re-read often between updates; rebuild only when coordinator.data is replaced.
+        data = self.coordinator.data
+        if data is not self._attrs_data:
+            self._attrs = self._build_attributes(data)
+            self._attrs_data = data
+        return self._attrs
+
+    def _native_value(self, data: dict):
+        return None
+
+    def _build_attributes(self, data: dict) -> dict | None:
+        return None
 
 
 class ZagrebTransitBasicSensor(ZagrebTransitBaseSensor):
@@ -77,34 +128,44 @@ class ZagrebTransitBasicSensor(ZagrebTransitBaseSensor):
         super().__init__(coordinator, unique_id, unique_id, icon)
         self._state_key = state_key
 
-    @property
-    def native_value(self):
-        return (self.coordinator.data or {}).get(self._state_key)
+    def _native_value(self, data: dict):
+        return data.get(self._state_key)
 
 
 class ZagrebTransitWatchRegistrySensor(ZagrebTransitBaseSensor):
     def __init__(self, coordinator) -> None:
         super().__init__(coordinator, "zagreb_transport_watch_registry", "zagreb_transport_watch_registry", "mdi:playlist-check")
+        self._attrs_entity_ids: dict[str, str] = {}
 
-    @property
-    def native_value(self):
-        return len((self.coordinator.data or {}).get("watch_ids", []))
+    def _native_value(self, data: dict):
+        return len(data.get("watch_ids", []))
 
     @property
     def extra_state_attributes(self):
-        data = self.coordinator.data or {}
+        # Entity ids come from the live watch sensors, not from coordinator.data.
+        if self._attrs_entity_ids != self.coordinator.watch_entity_ids:
+            self._attrs_entity_ids = dict(self.coordinator.watch_entity_ids)
+            self._attrs_data = None
+        return super().extra_state_attributes
+
+    def _build_attributes(self, data: dict) -> dict:
         watch_ids = data.get("watch_ids", [])
+        # Watches without a live sensor (e.g. disabled ones) fall back to an indexed registry lookup.
+        registry = er.async_get(self.hass) if self.hass is not None else None
         rows = []
         for watch_id in watch_ids:
             out = data.get("watches", {}).get(watch_id, {})
-            actual_entity_id = self._resolve_watch_entity_id(watch_id)
+            unique_id = f"zagreb_transport_watch_{out.get('watch_key') or watch_id}"
+            expected_entity_id = f"sensor.{unique_id}"
+            actual_entity_id = self._attrs_entity_ids.get(watch_id)
+            if actual_entity_id is None and registry is not None:
+                actual_entity_id = registry.async_get_entity_id("sensor", DOMAIN, unique_id)
             rows.append(
                 {
                     "watch_id": watch_id,
                     "watch_key": out.get("watch_key"),
-                    "entity_id": actual_entity_id
-                    or f"sensor.zagreb_transport_watch_{out.get('watch_key') or watch_id}",
-                    "expected_entity_id": f"sensor.zagreb_transport_watch_{out.get('watch_key') or watch_id}",
+                    "entity_id": actual_entity_id or expected_entity_id,
+                    "expected_entity_id": expected_entity_id,
                     "name": out.get("name"),
                     "type": out.get("type"),
                     "enabled": out.get("enabled"),
@@ -117,14 +178,6 @@ class ZagrebTransitWatchRegistrySensor(ZagrebTransitBaseSensor):
             "watches": rows,
         }
 
-    def _resolve_watch_entity_id(self, watch_id: str) -> str | None:
-        if self.hass is None:
-            return None
-        for st in self.hass.states.async_all("sensor"):
-            if st.attributes.get("watch_id") == watch_id:
-                return st.entity_id
-        return None
-
 
 class ZagrebTransitWatchSensor(ZagrebTransitBaseSensor):
     def __init__(self, coordinator, watch_id: str, watch_key: str) -> None:
@@ -134,21 +187,37 @@ class ZagrebTransitWatchSensor(ZagrebTransitBaseSensor):
             f"zagreb_transport_watch_{watch_key}",
             f"zagreb_transport_watch_{watch_key}",
             "mdi:routes-clock",
+            # The coordinator only notifies watch sensors whose watch output changed.
+            context=watch_id,
         )
+        self._watch_data: dict | None = None
+        self._current_watch: Mapping = _EMPTY_WATCH
 
-    @property
-    def native_value(self):
-        watch = (self.coordinator.data or {}).get("watches", {}).get(self._watch_id, {})
-        return watch.get("state", 0)
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.coordinator.watch_entity_ids[self._watch_id] = self.entity_id
+
+    async def async_will_remove_from_hass(self) -> None:
+        await super().async_will_remove_from_hass()
+        if self.coordinator.watch_entity_ids.get(self._watch_id) == self.entity_id:
+            del self.coordinator.watch_entity_ids[self._watch_id]
+
+    def _watch(self) -> Mapping:
+        data = self.coordinator.data
+        if data is not self._watch_data:
+            self._current_watch = data.get("watches", {}).get(self._watch_id) or _EMPTY_WATCH
+            self._watch_data = data
+        return self._current_watch
+
+    def _native_value(self, data: dict):
+        return self._watch().get("state", 0)
 
     @property
     def available(self) -> bool:
-        data = self.coordinator.data or {}
-        return self._watch_id in data.get("watches", {})
+        return self._watch() is not _EMPTY_WATCH
 
-    @property
-    def extra_state_attributes(self):
-        watch = (self.coordinator.data or {}).get("watches", {}).get(self._watch_id, {})
+    def _build_attributes(self, data: dict) -> dict:
+        watch = self._watch()
         attrs = {
             "watch_id": self._watch_id,
             "watch_key": watch.get("watch_key"),
@@ -159,18 +228,7 @@ class ZagrebTransitWatchSensor(ZagrebTransitBaseSensor):
             "config": watch.get("config", {}),
             "departures": watch.get("departures", []),
         }
-        if "grouped" in watch:
-            attrs["grouped"] = watch.get("grouped", [])
-        if "stations" in watch:
-            attrs["stations"] = watch.get("stations", [])
-        if "stops" in watch:
-            attrs["stops"] = watch.get("stops", [])
-        if "window_minutes" in watch:
-            attrs["window_minutes"] = watch.get("window_minutes")
-        if "radius_meters" in watch:
-            attrs["radius_meters"] = watch.get("radius_meters")
-        if "location_source" in watch:
-            attrs["location_source"] = watch.get("location_source")
+        attrs.update((key, watch[key]) for key in _OPTIONAL_WATCH_KEYS if key in watch)
         return attrs
 
 
@@ -178,13 +236,11 @@ class ZagrebTransitOdDoSensor(ZagrebTransitBaseSensor):
     def __init__(self, coordinator) -> None:
         super().__init__(coordinator, "zagreb_transport_next_trip_od_do", "zagreb_transport_next_trip_od_do", ICON_TRANSIT)
 
-    @property
-    def native_value(self):
-        return (self.coordinator.data or {}).get("od_do", {}).get("state", "unavailable")
+    def _native_value(self, data: dict):
+        return data.get("od_do", {}).get("state", "unavailable")
 
-    @property
-    def extra_state_attributes(self):
-        od_do = (self.coordinator.data or {}).get("od_do", {})
+    def _build_attributes(self, data: dict) -> dict:
+        od_do = data.get("od_do", {})
         return {
             "line": od_do.get("line"),
             "route": od_do.get("route"),
@@ -206,13 +262,11 @@ class ZagrebTransitStationBoardSensor(ZagrebTransitBaseSensor):
     def __init__(self, coordinator) -> None:
         super().__init__(coordinator, "zagreb_transport_station_direction_board", "zagreb_transport_station_direction_board", "mdi:bus-stop")
 
-    @property
-    def native_value(self):
-        return (self.coordinator.data or {}).get("station_board", {}).get("state", 0)
+    def _native_value(self, data: dict):
+        return data.get("station_board", {}).get("state", 0)
 
-    @property
-    def extra_state_attributes(self):
-        board = (self.coordinator.data or {}).get("station_board", {})
+    def _build_attributes(self, data: dict) -> dict:
+        board = data.get("station_board", {})
         return {
             "stop": board.get("stop"),
             "route": board.get("route"),
@@ -226,14 +280,10 @@ class ZagrebTransitDebugSensor(ZagrebTransitBaseSensor):
     def __init__(self, coordinator) -> None:
         super().__init__(coordinator, "zagreb_transport_debug_info", "zagreb_transport_debug_info", "mdi:bug")
 
-    @property
-    def native_value(self):
-        data = self.coordinator.data or {}
+    def _native_value(self, data: dict):
         return data.get("status", "unknown")
 
-    @property
-    def extra_state_attributes(self):
-        data = self.coordinator.data or {}
+    def _build_attributes(self, data: dict) -> dict:
         return data.get("debug", {})
 
 
@@ -241,58 +291,9 @@ class ZagrebTransitNearbyBoardSensor(ZagrebTransitBaseSensor):
     def __init__(self, coordinator) -> None:
         super().__init__(coordinator, "zagreb_transport_nearby_board", "zagreb_transport_nearby_board", "mdi:crosshairs-gps")
 
-    @property
-    def native_value(self):
-        return (self.coordinator.data or {}).get("nearby_board", {}).get("state", 0)
-
-    @property
-    def extra_state_attributes(self):
-        board = (self.coordinator.data or {}).get("nearby_board", {})
-        raw_stops = board.get("stops", []) or []
-        compact_stops = []
-        total_departures = 0
-
-        for stop in raw_stops:
-            departures = stop.get("departures", []) or []
-            total_departures += len(departures)
-            compact_departures = []
-            for dep in departures[:_NEARBY_ATTR_MAX_DEPARTURES_PER_STOP]:
-                compact_departures.append(
-                    {
-                        "line": dep.get("line"),
-                        "direction": dep.get("direction"),
-                        "minutes": dep.get("minutes"),
-                        "mode": dep.get("mode"),
-                        "rt": dep.get("rt"),
-                        "planned": dep.get("planned"),
-                        "delay_minutes": dep.get("delay_minutes"),
-                    }
-                )
-            compact_stops.append(
-                {
-                    "stop": stop.get("stop"),
-                    "distance_meters": stop.get("distance_meters"),
-                    "map_url": stop.get("map_url"),
-                    "departures": compact_departures,
-                    "departures_total": len(departures),
-                }
-            )
-
-        compact_stops = compact_stops[:_NEARBY_ATTR_MAX_STOPS]
-        truncated = (
-            len(raw_stops) > _NEARBY_ATTR_MAX_STOPS
-            or any(
-                len((stop.get("departures", []) or [])) > _NEARBY_ATTR_MAX_DEPARTURES_PER_STOP
-                for stop in raw_stops
-            )
-        )
+    def _native_value(self, data: dict):
+        return data.get("nearby_board", {}).get("state", 0)
 
-        return {
-            "reference_person": board.get("reference_person"),
-            "radius_meters": board.get("radius_meters"),
-            "window_minutes": board.get("window_minutes"),
-            "stops": compact_stops,
-            "stops_total": len(raw_stops),
-            "departures_total": total_departures,
-            "attributes_truncated": truncated,
-        }
+    def _build_attributes(self, data: dict) -> dict:
+        # Compacted by the coordinator during its executor build.
+        return data["nearby_board_attributes"]